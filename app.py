@@ -1,7 +1,6 @@
 import streamlit as st
 from datetime import datetime
 import random
-import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
 
@@ -14,6 +13,7 @@ from utils.layout import (
     render_title_bar
 )
 from backend.eda_analysis import FlightDataAnalysis
+from backend.data_loader_cleaner import DataLoaderCleaner
 
 # ===================== ⚙️ PAGE CONFIGURATION =====================
 st.set_page_config(
@@ -194,7 +194,7 @@ with k3:
     render_kpi("Cancelled Flights", "3.2%", color="#d62728")
 
 # ===================== 📊 DATA LOADING + ANALYSIS =====================
-df = pd.read_csv("data/Airline_Delay_Cause.csv")
+df = DataLoaderCleaner().load_data("data/Airline_Delay_Cause.csv")
 eda = FlightDataAnalysis(df)
 
 st.markdown("### Statistical Summary")
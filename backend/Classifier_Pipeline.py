@@ -1,17 +1,35 @@
 import os
+import threading
 import json
 import joblib
 import numpy as np
 import pandas as pd
+from scipy.sparse import issparse
 from sklearn.metrics import classification_report
 from backend.feature_engineering import FeatureEngineering
 from backend.data_loader_cleaner import DataLoaderCleaner
+from backend.feature_store import GroupFeatureStore
+from backend.feature_matrix import FeatureMatrixBuilder
+from backend.batch_scoring import BatchScorer
+from backend.record_features import RecordFeatures
+from backend.prediction_threads import get_thread_budget
 
 
 class ClassifierPipeline:
-    def __init__(self, thresholds_path="models/best_thresholds.json", default_strategy="Best Overall (Penalty Class 2 False Positives)"):
+    # XGBoost threads for predict_one: a single row gains nothing from more
+    RECORD_NTHREAD = 1
+
+    def __init__(self, thresholds_path="models/best_thresholds.json", default_strategy="Best Overall (Penalty Class 2 False Positives)",
+                 group_stats_path="models/group_stats.pkl", float_dtype=np.float64, nthread=None):
         """
         Initialize the pipeline with pre-trained model, encoder, scaler, and thresholds.
+        If the historical group statistics file exists, group-level features
+        are looked up from it instead of being aggregated over each input batch.
+        With float_dtype=np.float32 engineered features and model inputs are
+        kept in float32 (the precision XGBoost uses internally).
+        `nthread` is the number of XGBoost threads per prediction, capped at
+        the process thread budget (default: the whole budget, see
+        backend/prediction_threads.py); predict_one uses RECORD_NTHREAD.
         """
         base_path = os.path.dirname(__file__)
         models_dir = os.path.join(base_path, "..", "models")
@@ -43,6 +61,29 @@ class ClassifierPipeline:
             raise ValueError(f"Threshold strategy '{default_strategy}' not found.")
         self.threshold_strategy = default_strategy
 
+        # Compiled encoder/scaler -> model matrix plan; its inputs are the columns the model needs
+        self.matrix_builder = FeatureMatrixBuilder(self.encoder, self.scaler, self.expected_features)
+        self.model_inputs = self.matrix_builder.input_columns
+
+        # Load historical group statistics (optional)
+        stats_full_path = os.path.join(base_path, "..", group_stats_path) if group_stats_path else None
+        if stats_full_path and os.path.exists(stats_full_path):
+            self.feature_store = GroupFeatureStore.load(stats_full_path)
+        else:
+            self.feature_store = None
+
+        self.float_dtype = np.dtype(float_dtype)
+        self._sparse_booster = None
+        self._record_features = None
+
+        # Predictions go straight to the booster; threads are capped by the process budget per call
+        if nthread is not None and nthread < 1:
+            raise ValueError("nthread must be at least 1")
+        self.nthread = nthread
+        self.booster = self.model.get_booster()
+        self._thread_boosters = {}
+        self._thread_boosters_lock = threading.Lock()
+
     def set_threshold_strategy(self, strategy_name):
         """
         Set a custom threshold strategy (for class probability weighting).
@@ -51,59 +92,147 @@ class ClassifierPipeline:
             raise ValueError(f"Strategy '{strategy_name}' not found.")
         self.threshold_strategy = strategy_name
 
-    def preprocess(self, df):
+    def engineer_features(self, clean_df, columns=None):
         """
-        Clean, encode, and scale features. Aligns with training-time feature order.
+        Feature-engineer cleaned input. Uses the historical group statistics
+        when available, so group features do not depend on the batch.
+        With `columns`, only those columns (and what they depend on) are built.
         """
-        df = df.copy()
-
-        # Drop unnecessary or leakage columns
-        drop_cols = [
-            'carrier_name', 'airport_name', 'arr_flights', 'arr_del15',
-            'carrier_ct', 'weather_ct', 'nas_ct', 'security_ct', 'late_aircraft_ct',
-            'arr_cancelled', 'arr_diverted', 'arr_delay', 'carrier_delay',
-            'weather_delay', 'nas_delay', 'security_delay', 'late_aircraft_delay',
-            'total_delay', 'delay_ratio', 'high_delay_flag', 'delay_risk_level',
-            'year_month', 'season_airport_combo'
-        ]
-        df.drop(columns=[col for col in drop_cols if col in df.columns], inplace=True, errors='ignore')
+        totals = self.feature_store.totals if self.feature_store is not None else None
+        engineer = FeatureEngineering(float_dtype=self.float_dtype)
+        return engineer.transform(clean_df, group_totals=totals, columns=columns)
 
-        # Ensure categories are string
-        for col in df.columns:
-            if df[col].dtype.name == "category":
-                df[col] = df[col].astype(str)
+    def build_matrix(self, clean_df, sparse=False, group_totals=None):
+        """
+        Compiled path: feature-engineer cleaned input and write it straight into
+        a float32 matrix in expected_features order (same values as
+        engineer_features + preprocess, without the intermediate DataFrames).
+        With sparse=True the matrix is a SciPy CSR matrix. `group_totals`
+        replaces the feature store's statistics for the group features.
+        Returns (matrix, target).
+        """
+        totals = group_totals
+        if totals is None and self.feature_store is not None:
+            totals = self.feature_store.totals
+        features = FeatureEngineering(float_dtype=self.float_dtype).lazy(clean_df, group_totals=totals)
+        features.request(self.model_inputs + ["delay_risk_level"])
+        build = self.matrix_builder.build_sparse if sparse else self.matrix_builder.build
+        return build(features), features["delay_risk_level"]
 
-        # Split columns by encoding and scaling
-        cat_cols = [col for col in self.encoder.feature_names_in_ if col in df.columns]
-        num_cols = [col for col in self.scaler.feature_names_in_ if col in df.columns]
+    def preprocess(self, df):
+        """
+        Encode and scale features. Aligns with training-time feature order.
 
-        encoded = self.encoder.transform(df[cat_cols]) if cat_cols else np.zeros((len(df), 0))
-        scaled = self.scaler.transform(df[num_cols]) if num_cols else np.zeros((len(df), 0))
+        Uses the plan compiled at __init__ (matrix_builder): every scaled and
+        one-hot value is written straight to its expected_features position in
+        one preallocated array. Only the encoder/scaler inputs are read, so
+        identifier, leakage and target columns never reach the model.
+        """
+        matrix = self.matrix_builder.build(df, dtype=self.float_dtype)
+        return pd.DataFrame(matrix, columns=self.expected_features, index=df.index, copy=False)
 
-        df_cat = pd.DataFrame(encoded, columns=self.encoder.get_feature_names_out(cat_cols), index=df.index)
-        df_num = pd.DataFrame(scaled, columns=num_cols, index=df.index)
+    def sparse_booster(self):
+        """Booster for CSR input (see FeatureMatrixBuilder.sparse_booster), built on first use."""
+        if self._sparse_booster is None:
+            self._sparse_booster = self.matrix_builder.sparse_booster(self.booster)
+        return self._sparse_booster
 
-        final_df = pd.concat([df_num, df_cat], axis=1)
-        aligned_df = final_df.reindex(columns=self.expected_features, fill_value=0)
+    def thread_booster(self, sparse, nthread):
+        """
+        Copy of the booster (or of sparse_booster) set to `nthread` threads,
+        made once per thread count. Pipelines are shared between sessions, so
+        the parameters of a booster other threads may be predicting with are
+        never changed.
+        """
+        with self._thread_boosters_lock:
+            key = (sparse, nthread)
+            if key not in self._thread_boosters:
+                booster = (self.sparse_booster() if sparse else self.booster).copy()
+                booster.set_param({"nthread": nthread})
+                self._thread_boosters[key] = booster
+            return self._thread_boosters[key]
 
-        return aligned_df
+    def inplace_predict(self, X, nthread=None):
+        """
+        Booster inplace prediction for a NumPy matrix, CSR matrix (scored by
+        sparse_booster) or DataFrame (column names checked, as in the sklearn
+        wrapper). Runs with `nthread` threads (default: the pipeline's
+        `nthread`), capped at the current process thread budget and held from
+        it while predicting, so concurrent callers do not oversubscribe the cores.
+        """
+        sparse = issparse(X)
+        validate = not sparse and isinstance(X, pd.DataFrame)
+        budget = get_thread_budget()
+        nthread = budget.limit(self.nthread if nthread is None else nthread)
+        booster = self.thread_booster(sparse, nthread)
+        return budget.run(nthread, booster.inplace_predict, X, validate_features=validate)
 
     def predict_proba(self, X):
         """
         Return class probabilities from the model.
         """
-        return self.model.predict_proba(X)
+        # One column per class, also for an empty X (XGBoost returns shape (0, 0))
+        return self.inplace_predict(X).reshape(X.shape[0], self.model.n_classes_)
 
-    def predict(self, X):
+    def apply_thresholds(self, probs):
         """
-        Apply custom threshold weighting and return class predictions.
+        Weight class probabilities with the current threshold strategy and
+        return the class predictions.
         """
-        probs = self.predict_proba(X)
         weights = self.thresholds_dict[self.threshold_strategy]
         scaled = probs * (weights / weights.sum())
         return np.argmax(scaled, axis=1)
 
-    def run_pipeline(self, df: pd.DataFrame, mode: str = "test"):
+    def predict(self, X):
+        """
+        Apply custom threshold weighting and return class predictions.
+        """
+        return self.apply_thresholds(self.predict_proba(X))
+
+    def record_features(self):
+        """RecordFeatures for predict_one (group lookups precomputed from the feature store), built on first use."""
+        if self._record_features is None:
+            totals = self.feature_store.totals if self.feature_store is not None else None
+            self._record_features = RecordFeatures(totals, float_dtype=self.float_dtype)
+        return self._record_features
+
+    def predict_one(self, record: dict):
+        """
+        Fast path for scoring a single record (a dict of raw input fields,
+        see RecordFeatures.REQUIRED_FIELDS) without building DataFrames.
+        Features are computed in plain Python with precomputed group
+        lookups and written into one NumPy row. Returns the predicted risk
+        level, the same as run_pipeline on a one-row frame.
+        """
+        row = self.matrix_builder.build_one(self.record_features().compute(record))
+        probs = self.inplace_predict(row, nthread=self.RECORD_NTHREAD)
+        return int(self.apply_thresholds(probs)[0])
+
+    def score_csv(self, input_path, output_path, chunksize=100_000, id_columns=None, sparse=False, fmt=None):
+        """
+        Score a CSV file of any size with bounded memory (see BatchScorer).
+
+        The file is read, cleaned and scored `chunksize` rows at a time and
+        each chunk's predictions are appended to `output_path` (CSV, or
+        Parquet for a .parquet/.pq path): the `id_columns` (default year,
+        month, carrier, airport), `predicted_risk_level` and the class
+        probabilities `prob_low`, `prob_moderate`, `prob_high`.
+        Group features use the historical group statistics.
+        """
+        def score_chunk(clean_chunk, group_totals):
+            X, _ = self.build_matrix(clean_chunk, sparse=sparse, group_totals=group_totals)
+            probs = self.predict_proba(X)
+            return pd.DataFrame({
+                "predicted_risk_level": self.apply_thresholds(probs),
+                "prob_low": probs[:, 0],
+                "prob_moderate": probs[:, 1],
+                "prob_high": probs[:, 2],
+            })
+
+        scorer = BatchScorer(self.feature_store, chunksize=chunksize)
+        return scorer.score(input_path, output_path, score_chunk, id_columns=id_columns, fmt=fmt)
+
+    def run_pipeline(self, df: pd.DataFrame, mode: str = "test", as_matrix: bool = False, sparse: bool = False):
         """
         Runs full pipeline on user-provided DataFrame:
         - Cleans and feature engineers
@@ -113,15 +242,23 @@ class ClassifierPipeline:
         Modes:
         - 'test'     → requires target column and returns evaluation
         - 'realtime' → no targets, returns predictions only
+
+        With as_matrix=True the compiled build_matrix path is used and
+        X_input is a float32 NumPy matrix instead of a DataFrame; sparse=True
+        uses that path with a CSR matrix (less memory for large batches).
         """
         cleaner = DataLoaderCleaner()
         clean_df = cleaner.clean_data(df)
-        engineered_df = FeatureEngineering().transform(clean_df)
+        if as_matrix or sparse:
+            X_proc, y_true = self.build_matrix(clean_df, sparse=sparse)
+        else:
+            # Only build the features the encoder/scaler consume, plus the target
+            engineered_df = self.engineer_features(clean_df, columns=self.model_inputs + ["delay_risk_level"])
+            X, y_true = cleaner.split_features_and_target(engineered_df)
+            X_proc = self.preprocess(X)
 
         if mode == "test":
             # Expect the uploaded dataset to contain the target column
-            X, y_true = cleaner.split_features_and_target(engineered_df)
-            X_proc = self.preprocess(X)
             y_pred = self.predict(X_proc)
 
             report = classification_report(y_true, y_pred, digits=4, labels=[0, 1, 2], zero_division=0)
@@ -134,8 +271,6 @@ class ClassifierPipeline:
             }
 
         elif mode == "realtime":
-            X_input, _ = cleaner.split_features_and_target(engineered_df)
-            X_proc = self.preprocess(X_input)
             y_pred = self.predict(X_proc)
             return {
                 "X_input": X_proc,
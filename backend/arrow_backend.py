@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class ArrowFeatures:
+    """
+    Arrow compute implementation of `FeatureEngineering.transform`.
+
+    Selected with `FeatureEngineering(backend="arrow")`. Input columns are
+    handed to Arrow as zero-copy arrays, every engineered feature (ratios,
+    delay percentages, season and year-month keys, group rates, risk level,
+    dominant cause) is computed with `pyarrow.compute` kernels, and the
+    results are converted back into the same pandas frame the default
+    backend returns.
+    """
+
+    def __init__(self, engineer):
+        self.engineer = engineer
+
+    @staticmethod
+    def _float(series):
+        # From NumPy, NaN stays a float NaN (not an Arrow null), as in pandas
+        return pa.array(series.to_numpy(dtype=np.float64))
+
+    @staticmethod
+    def _fill_nan(values, fill=0.0):
+        return pc.if_else(pc.is_nan(values), fill, values)
+
+    @staticmethod
+    def _to_numpy(values):
+        return values.to_numpy(zero_copy_only=False)
+
+    @staticmethod
+    def _factorize(values, keep_null=False):
+        """
+        Return (codes, sorted uniques) like `pd.factorize(sort=True)`; nulls get
+        a null code, or with `keep_null` are kept as the last unique value.
+        """
+        if pa.types.is_dictionary(values.type):
+            values = values.dictionary_decode()
+        uniques = pc.drop_null(pc.unique(values))
+        uniques = uniques.take(pc.array_sort_indices(uniques))
+        if keep_null and values.null_count:
+            uniques = pa.concat_arrays([uniques, pa.nulls(1, uniques.type)])
+        return pc.index_in(values, value_set=uniques), uniques
+
+    @staticmethod
+    def _categorical(codes, categories, index):
+        codes = codes.fill_null(-1).to_numpy(zero_copy_only=False)
+        return pd.Series(pd.Categorical.from_codes(codes, categories), index=index)
+
+    def _composite(self, parts, sep, formats=None):
+        """
+        Arrow counterpart of `FeatureEngineering.combine_keys`: (codes, string
+        labels). Missing parts are kept as a value labelled 'nan'.
+        """
+        codes = None
+        uniques_list = []
+        for part in parts:
+            part_codes, uniques = self._factorize(part, keep_null=True)
+            part_codes = part_codes.cast(pa.int64())
+            codes = part_codes if codes is None else pc.add(pc.multiply(codes, len(uniques)), part_codes)
+            uniques_list.append(uniques)
+
+        combo_codes, combos = self._factorize(codes)
+        labels = None
+        remainder = combos
+        for i in reversed(range(len(parts))):
+            uniques = uniques_list[i]
+            quotient = pc.divide(remainder, len(uniques))  # integer division
+            # Labels of the distinct values only, formatted like `astype(str)` (5.0 -> '5.0', missing -> 'nan')
+            strings = pa.array(['nan' if value is None else str(value) for value in uniques.to_pylist()], pa.string())
+            part_labels = strings.take(pc.subtract(remainder, pc.multiply(quotient, len(uniques))))
+            if formats and formats[i] is not None:
+                part_labels = formats[i](part_labels)
+            labels = part_labels if labels is None else pc.binary_join_element_wise(part_labels, labels, sep)
+            remainder = quotient
+        return combo_codes, labels
+
+    def _group_feature(self, feature, key_codes, size, cols, sums):
+        """Broadcast per-group sums (or their ratio) back to the rows."""
+        _, numerator, denominator = self.engineer.GROUP_FEATURES[feature]
+
+        def group_sum(col):
+            if col not in sums:
+                table = pa.table({'key': key_codes, 'value': self._fill_nan(cols[col])})
+                grouped = table.group_by('key').aggregate([('value', 'sum')]).filter(pc.is_valid(pc.field('key')))
+                dense = np.zeros(size)
+                dense[self._to_numpy(grouped['key'])] = self._to_numpy(grouped['value_sum'])
+                sums[col] = pa.array(dense)
+            return sums[col]
+
+        values = group_sum(numerator)
+        if denominator is not None:
+            values = pc.divide(values, group_sum(denominator))
+        return values.take(key_codes)
+
+    def _lookup_feature(self, feature, key_values, totals):
+        """Group feature from historical totals (unknown keys: 0 for sums, NaN for rates; missing keys: NaN)."""
+        key, numerator, denominator = self.engineer.GROUP_FEATURES[feature]
+        sums = totals[key]
+        if pa.types.is_dictionary(key_values.type):
+            key_values = key_values.dictionary_decode()
+        value_set = pa.array(list(sums.index)).cast(key_values.type)
+        positions = pc.index_in(key_values, value_set=value_set)
+
+        num = pa.array(sums[numerator].to_numpy(dtype=np.float64)).take(positions)
+        if denominator is None:
+            return pc.if_else(pc.is_null(key_values), np.nan, num.fill_null(0.0))
+        den = pa.array(sums[denominator].to_numpy(dtype=np.float64)).take(positions)
+        return pc.divide(num, den)
+
+    def transform(self, df, fillna=True, group_totals=None, columns=None):
+        engineer = self.engineer
+        index = df.index
+        delay_cols = engineer.DELAY_COLS
+        cols = {}
+        out = {}
+
+        # ➤ Handle arr_flights = 0 to prevent division errors
+        flights = self._float(df['arr_flights'])
+        cols['arr_flights'] = pc.if_else(pc.equal(flights, 0.0), np.nan, flights)
+        # Without zeros the column is returned unchanged (an integer column stays integer)
+        out['arr_flights'] = cols['arr_flights'] if pc.any(pc.equal(flights, 0.0)).as_py() else df['arr_flights']
+        for col in ['arr_del15', 'arr_cancelled', 'arr_diverted'] + delay_cols:
+            cols[col] = self._float(df[col])
+
+        # ➤ Delay ratios and rates
+        out['delay_ratio'] = pc.divide(cols['arr_del15'], cols['arr_flights'])
+        out['cancellation_rate'] = pc.divide(cols['arr_cancelled'], cols['arr_flights'])
+        out['diversion_rate'] = pc.divide(cols['arr_diverted'], cols['arr_flights'])
+        out['disrupted'] = pc.or_(pc.greater(cols['arr_del15'], 0.0), pc.greater(cols['arr_cancelled'], 0.0)).cast(pa.int64())
+
+        # ➤ Total delay and individual delay percentages
+        total = self._fill_nan(cols[delay_cols[0]])
+        for col in delay_cols[1:]:
+            total = pc.add(total, self._fill_nan(cols[col]))
+        out['total_delay'] = total = pc.if_else(pc.equal(total, 0.0), np.nan, total)
+        for col, pct in zip(delay_cols, engineer.DELAY_PCT_COLS):
+            out[pct] = pc.divide(cols[col], total)
+            if fillna:
+                out[pct] = self._fill_nan(out[pct])
+
+        # ➤ Time-based features
+        # Missing keys become nulls (not NaN values) so they are left out of the groups
+        year = pa.array(df['year'], from_pandas=True)
+        month = pa.array(df['month'], from_pandas=True)
+        ym_codes, ym_labels = self._composite([year, month], '-', formats=[None, lambda s: pc.utf8_lpad(s, 2, '0')])
+        out['year_month'] = self._categorical(ym_codes, self._to_numpy(ym_labels), index)
+
+        season_labels = sorted(set(engineer.SEASON_BY_MONTH.values()) | {'Fall'})
+        table = pa.array([season_labels.index(engineer.SEASON_BY_MONTH.get(m, 'Fall')) for m in range(13)], pa.int8())
+        month_f = pc.cast(month, pa.float64())
+        valid = pc.and_(pc.and_(pc.greater_equal(month_f, 1.0), pc.less_equal(month_f, 12.0)), pc.equal(month_f, pc.floor(month_f)))
+        season_codes = table.take(pc.if_else(valid, month_f, 0.0).cast(pa.int64()).fill_null(0))
+        season = pa.DictionaryArray.from_arrays(season_codes, pa.array(season_labels))
+        out['season'] = pd.Series(np.array(season_labels, dtype=object)[self._to_numpy(season_codes)], index=index)
+
+        airport = pa.array(df['airport'])
+        combo_codes, combo_labels = self._composite([season, airport], '_')
+        out['season_airport_combo'] = self._categorical(combo_codes, self._to_numpy(combo_labels), index)
+
+        # ➤ Group-level aggregated features
+        keys = {'carrier': pa.array(df['carrier']), 'airport': airport, 'month': month, 'season_airport_combo': combo_codes}
+        sums_by_key = {}
+        for feature, (key, _, _) in engineer.GROUP_FEATURES.items():
+            if group_totals is not None:
+                key_values = keys[key] if key != 'season_airport_combo' else combo_labels.take(combo_codes)
+                out[feature] = self._lookup_feature(feature, key_values, group_totals)
+                continue
+            if key == 'season_airport_combo':
+                codes, size = combo_codes, len(combo_labels)
+            else:
+                codes, uniques = self._factorize(keys[key])
+                size = len(uniques)
+            out[feature] = self._group_feature(feature, codes, size, cols, sums_by_key.setdefault(key, {}))
+
+        # Plain sums of an integer column stay integer, as in the pandas backend
+        for feature, (_, numerator, denominator) in engineer.GROUP_FEATURES.items():
+            if denominator is None and not pc.any(pc.is_nan(cols[numerator])).as_py():
+                values = engineer.restore_int_sum(self._to_numpy(out[feature]), df[numerator].dtype)
+                out[feature] = pd.Series(values, index=index)
+
+        # ➤ Label: delay_risk_level
+        ratio = out['delay_ratio']
+        levels = pc.if_else(pc.less_equal(ratio, 0.20), 0, pc.if_else(pc.less_equal(ratio, 0.40), 1, 2)).cast(pa.int64())
+        missing = pc.is_nan(ratio)
+        if pc.any(missing).as_py():
+            levels = pc.if_else(missing, np.nan, levels.cast(pa.float64()))
+        out['delay_risk_level'] = levels
+
+        # ➤ Additional features
+        out['mean_delay_per_flight'] = self._fill_nan(pc.divide(total, cols['arr_flights']))
+
+        best = pa.array(np.full(len(df), -np.inf))
+        cause = pa.array(np.zeros(len(df), dtype=np.int8))
+        all_missing = None
+        for i, col in enumerate(delay_cols):
+            values = self._fill_nan(cols[col], -np.inf)
+            higher = pc.greater(values, best)
+            best = pc.if_else(higher, values, best)
+            cause = pc.if_else(higher, pa.scalar(i, pa.int8()), cause)
+            nan = pc.is_nan(cols[col])
+            all_missing = nan if all_missing is None else pc.and_(all_missing, nan)
+        cause = pc.if_else(all_missing, pa.scalar(None, pa.int8()), cause)
+        out['dominant_delay_cause'] = self._categorical(cause, delay_cols, index)
+
+        # Carrier vs airport pressure
+        out['carrier_vs_airport_ratio'] = pc.divide(
+            out['carrier_delay_pct'], pc.add(pc.add(out['weather_delay_pct'], out['nas_delay_pct']), 1e-6))
+
+        # ➤ Assemble the pandas frame in transform's column order
+        if columns is None:
+            columns = list(df.columns) + [name for name in engineer.output_features() if name not in df.columns]
+        frame = {}
+        for name in columns:
+            value = out[name] if name in out else df[name]
+            if not isinstance(value, pd.Series):
+                value = pd.Series(self._to_numpy(value), index=index)
+            if fillna and pd.api.types.is_numeric_dtype(value) and not pd.api.types.is_bool_dtype(value):
+                value = value.fillna(0)
+            frame[name] = engineer.cast_output(name, value)
+        return pd.DataFrame(frame, index=index)
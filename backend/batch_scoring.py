@@ -0,0 +1,137 @@
+import os
+import pandas as pd
+from backend.data_loader_cleaner import DataLoaderCleaner
+from backend.feature_store import GroupFeatureStore
+
+
+class PredictionWriter:
+    """
+    Appends prediction chunks to one CSV or Parquet file.
+
+    The format follows the file extension (`.parquet`/`.pq` -> Parquet,
+    anything else -> CSV) unless `fmt` is given. Chunks are written to a
+    temporary file that replaces `path` on `close()`, so a failed run never
+    leaves a half-written output behind.
+    """
+
+    PARQUET_EXTENSIONS = (".parquet", ".pq")
+
+    def __init__(self, path, fmt=None):
+        if fmt is None:
+            fmt = "parquet" if path.lower().endswith(self.PARQUET_EXTENSIONS) else "csv"
+        if fmt not in ("csv", "parquet"):
+            raise ValueError("fmt must be 'csv' or 'parquet'")
+        self.path = path
+        self.fmt = fmt
+        self.tmp_path = f"{path}.tmp{os.getpid()}"
+        self.rows = 0
+        self._parquet = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, df):
+        # Categorical dictionaries differ between chunks; write them as plain strings
+        df = df.assign(**{col: df[col].astype(str) for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+        if self.fmt == "csv":
+            df.to_csv(self.tmp_path, index=False, mode="w" if self.rows == 0 else "a", header=self.rows == 0)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.tmp_path, table.schema)
+            self._parquet.write_table(table.cast(self._parquet.schema))
+        self.rows += len(df)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        elif not os.path.exists(self.tmp_path):
+            # Nothing written at all (no input rows): still produce an (empty) output file
+            open(self.tmp_path, "w").close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        if self._parquet is not None:
+            self._parquet.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+
+class BatchScorer:
+    """
+    Bounded-memory scoring of a CSV file of any size.
+
+    The input is read `chunksize` rows at a time, each chunk is cleaned like
+    `DataLoaderCleaner.clean_data`, scored by `score_chunk(clean_chunk,
+    group_totals)` and appended to the output, so only one chunk is held in
+    memory at a time.
+
+    Group-level features come from the pipeline's historical group statistics
+    (`GroupFeatureStore`), never from the chunk itself, so a row gets the
+    same prediction whatever the chunk size. Without stored statistics, a
+    first pass over the file builds them from the whole input, which matches
+    what `run_pipeline` computes when the file is scored in one go.
+    """
+
+    ID_COLUMNS = ["year", "month", "carrier", "airport"]
+
+    def __init__(self, feature_store=None, chunksize=100_000):
+        self.feature_store = feature_store
+        self.chunksize = chunksize
+        self.cleaner = DataLoaderCleaner()
+
+    def clean_chunks(self, input_path):
+        # Categories are inferred per chunk: the matrix builder maps values, not codes
+        return self.cleaner.iter_clean_chunks(input_path, chunksize=self.chunksize, categories={})
+
+    def group_totals(self, input_path):
+        """Historical group totals, or totals of the whole input file when none are stored."""
+        if self.feature_store is not None:
+            return self.feature_store.totals
+        store = GroupFeatureStore()
+        for chunk in self.clean_chunks(input_path):
+            if not chunk.empty:
+                store.update(chunk)
+        return store.totals
+
+    def score(self, input_path, output_path, score_chunk, id_columns=None, fmt=None):
+        """
+        Score `input_path` chunk by chunk and stream the results to `output_path`.
+        Each output row holds the `id_columns` found in the input plus the
+        prediction columns returned by `score_chunk`.
+        Returns a summary dict (rows read, rows scored, output path); the
+        cleaning statistics of the run are in `self.cleaner.comparison`.
+        """
+        id_columns = self.ID_COLUMNS if id_columns is None else list(id_columns)
+        totals = self.group_totals(input_path)
+
+        def scored(chunk, group_totals):
+            predictions = score_chunk(chunk, group_totals)
+            ids = chunk[[col for col in id_columns if col in chunk.columns]].reset_index(drop=True)
+            return pd.concat([ids, predictions.reset_index(drop=True)], axis=1)
+
+        empty_chunk = None
+        with PredictionWriter(output_path, fmt=fmt) as writer:
+            for chunk in self.clean_chunks(input_path):
+                if chunk.empty:
+                    empty_chunk = chunk if empty_chunk is None else empty_chunk
+                    continue
+                writer.write(scored(chunk, totals))
+            if writer.rows == 0 and empty_chunk is not None:
+                # Every row was dropped: still write the header (CSV) or schema (Parquet).
+                # Totals of a file without rows are empty; group the empty chunk itself instead
+                writer.write(scored(empty_chunk, totals or None))
+
+        return {
+            "rows_read": self.cleaner.comparison["raw_shape"][0] if self.cleaner.comparison else 0,
+            "rows_scored": writer.rows,
+            "output_path": output_path,
+        }
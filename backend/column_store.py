@@ -0,0 +1,197 @@
+import os
+import errno
+import json
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from backend.data_loader_cleaner import DataLoaderCleaner
+from backend.feature_engineering import FeatureEngineering
+
+
+class ColumnStore:
+    """
+    Memory-mapped column store for DataFrames.
+
+    Each saved frame is a folder with one `.npy` file per column (categoricals
+    are stored as their integer codes) plus a `schema.json`. Loading maps the
+    files read-only with `np.load(mmap_mode='r')` and wraps them in a DataFrame
+    without copying, so every process that loads the same store shares one
+    physical copy of the data through the OS page cache.
+
+    Object (string) columns are stored as categoricals and come back as
+    `category` dtype. Loaded frames are read-only unless loaded with
+    `writable=True` (copy-on-write mapping).
+    """
+
+    FORMAT_VERSION = 1
+    STAGES = ("raw", "clean", "fe")
+
+    def __init__(self, root):
+        self.root = root
+
+    def _frame_dir(self, name):
+        return os.path.join(self.root, name)
+
+    def save(self, name, df, source=None):
+        """
+        Write `df` under `name`, replacing any previous version.
+
+        The frame is written to a private temporary folder (safe with several
+        writers in one process, e.g. Streamlit session threads) and swapped in
+        with renames, so readers never see a partially written frame; between
+        the two renames the frame is briefly absent. With concurrent writers
+        of the same name the last swap wins.
+        """
+        final_dir = self._frame_dir(name)
+        os.makedirs(self.root, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{name}.tmp", dir=self.root)
+        try:
+            self._write_frame(tmp_dir, df, source)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self._swap_in(tmp_dir, final_dir, name)
+
+    def _swap_in(self, tmp_dir, final_dir, name):
+        """Move the old frame folder aside and rename `tmp_dir` into its place."""
+        while True:
+            aside = tempfile.mkdtemp(prefix=f".{name}.old", dir=self.root)
+            try:
+                try:
+                    os.replace(final_dir, aside)  # a directory may replace an empty one
+                except FileNotFoundError:
+                    pass
+                try:
+                    os.rename(tmp_dir, final_dir)
+                    return
+                except OSError as e:
+                    # Another writer swapped its version in meanwhile: move that aside too
+                    if e.errno not in (errno.ENOTEMPTY, errno.EEXIST):
+                        raise
+            finally:
+                shutil.rmtree(aside, ignore_errors=True)
+
+    def _write_frame(self, tmp_dir, df, source):
+        """Write the column files and schema of `df` into `tmp_dir`."""
+        columns = []
+        for i, col in enumerate(df.columns):
+            series = df[col]
+            entry = {"name": col, "file": f"{i}.npy"}
+            if series.dtype == object or isinstance(series.dtype, pd.CategoricalDtype):
+                cat = series.astype("category").cat
+                entry["kind"] = "category"
+                entry["categories"] = cat.categories.tolist()
+                values = cat.codes.to_numpy()
+            else:
+                entry["kind"] = "array"
+                values = series.to_numpy()
+            np.save(os.path.join(tmp_dir, entry["file"]), values)
+            columns.append(entry)
+
+        has_index = not isinstance(df.index, pd.RangeIndex) or df.index.start != 0 or df.index.step != 1
+        if has_index:
+            np.save(os.path.join(tmp_dir, "index.npy"), df.index.to_numpy())
+
+        schema = {
+            "version": self.FORMAT_VERSION,
+            "rows": len(df),
+            "columns": columns,
+            "index": has_index,
+            "source": source,
+        }
+        with open(os.path.join(tmp_dir, "schema.json"), "w") as f:
+            json.dump(schema, f)
+
+    def read_schema(self, name):
+        """Return the stored schema for `name`, or None if it does not exist."""
+        try:
+            with open(os.path.join(self._frame_dir(name), "schema.json"), "r") as f:
+                schema = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if schema.get("version") != self.FORMAT_VERSION:
+            return None
+        return schema
+
+    def load(self, name, writable=False):
+        """
+        Return a read-only DataFrame whose columns are views on the mapped files.
+        With `writable=True` the files are mapped copy-on-write instead: the
+        frame can be modified in memory (only the pages written to are
+        copied) while the files on disk never change.
+        """
+        mmap_mode = "c" if writable else "r"
+        schema = self.read_schema(name)
+        if schema is None:
+            raise FileNotFoundError(f"No column store frame named '{name}' in {self.root}")
+        frame_dir = self._frame_dir(name)
+
+        data = {}
+        for entry in schema["columns"]:
+            values = np.load(os.path.join(frame_dir, entry["file"]), mmap_mode=mmap_mode)
+            if entry["kind"] == "category":
+                values = pd.Categorical.from_codes(values, categories=entry["categories"])
+            data[entry["name"]] = values
+
+        if schema["index"]:
+            index = pd.Index(np.load(os.path.join(frame_dir, "index.npy"), mmap_mode=mmap_mode), copy=False)
+        else:
+            index = pd.RangeIndex(schema["rows"])
+
+        return pd.DataFrame(data, index=index, copy=False)
+
+    @staticmethod
+    def source_fingerprint(file_path):
+        stat = os.stat(file_path)
+        return {"path": os.path.abspath(file_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def is_current(self, file_path):
+        """Check whether all stages were built from the current version of `file_path`."""
+        fingerprint = self.source_fingerprint(file_path)
+        for stage in self.STAGES:
+            schema = self.read_schema(stage)
+            if schema is None or schema.get("source") != fingerprint:
+                return False
+        return True
+
+    def build_stages(self, file_path):
+        """
+        Run load -> clean -> feature engineering on `file_path` and store the
+        raw, cleaned and feature-engineered frames.
+        """
+        fingerprint = self.source_fingerprint(file_path)
+        cleaner = DataLoaderCleaner()
+        raw = cleaner.load_data(file_path)
+        clean = cleaner.clean_data(raw)
+        engineer = FeatureEngineering()
+        fe = engineer.transform(clean)
+
+        for stage, df in zip(self.STAGES, (raw, clean, fe)):
+            self.save(stage, df, source=fingerprint)
+        self.save_group_totals(engineer.group_totals(fe), source=fingerprint)
+
+    def save_group_totals(self, totals, source=None):
+        """Store the per-group sums produced by `FeatureEngineering.group_totals`."""
+        for key, sums in totals.items():
+            self.save(f"totals_{key}", sums.rename_axis(key).reset_index(), source=source)
+
+    def load_group_totals(self):
+        """Return the stored group totals, or None if any of them is missing."""
+        totals = {}
+        for key, _, _ in FeatureEngineering.GROUP_FEATURES.values():
+            if self.read_schema(f"totals_{key}") is None:
+                return None
+            sums = self.load(f"totals_{key}").set_index(key)
+            sums.index = sums.index.astype(object)
+            totals[key] = sums
+        return totals
+
+    def load_stages(self, file_path):
+        """
+        Return (raw, clean, fe) as memory-mapped frames, building the store
+        first if it is missing or older than `file_path`.
+        """
+        if not self.is_current(file_path):
+            self.build_stages(file_path)
+        return tuple(self.load(stage) for stage in self.STAGES)
@@ -0,0 +1,102 @@
+import os
+import json
+import hashlib
+import pandas as pd
+
+
+class CsvCache:
+    """
+    Columnar (Parquet) cache for CSV files.
+
+    The cache lives in a `.cache` folder next to the CSV and is keyed by the
+    CSV fingerprint (size, mtime and content hash). A cheap size/mtime check is
+    tried first; the content hash is only computed when those have changed, so
+    touching or copying the CSV does not force a re-parse.
+    """
+
+    CACHE_DIR = ".cache"
+    FORMAT_VERSION = 1
+    HASH_BLOCK_SIZE = 1 << 20
+
+    def __init__(self, file_path, variant="raw"):
+        self.file_path = os.path.abspath(file_path)
+        folder, name = os.path.split(self.file_path)
+        stem = os.path.splitext(name)[0]
+        self.cache_dir = os.path.join(folder, self.CACHE_DIR)
+        self.data_path = os.path.join(self.cache_dir, f"{stem}.{variant}.parquet")
+        self.meta_path = os.path.join(self.cache_dir, f"{stem}.{variant}.meta.json")
+
+    def content_hash(self):
+        """Return the SHA-256 digest of the CSV contents."""
+        digest = hashlib.sha256()
+        with open(self.file_path, "rb") as f:
+            for block in iter(lambda: f.read(self.HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _stat(self):
+        stat = os.stat(self.file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _read_meta(self):
+        try:
+            with open(self.meta_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def is_valid(self):
+        """Check whether the cached copy still matches the CSV on disk."""
+        meta = self._read_meta()
+        if meta is None or meta.get("version") != self.FORMAT_VERSION:
+            return False
+        if not os.path.exists(self.data_path):
+            return False
+
+        stat = self._stat()
+        if meta["size"] == stat["size"] and meta["mtime_ns"] == stat["mtime_ns"]:
+            return True
+        if meta["size"] != stat["size"]:
+            return False
+
+        # Same size but new mtime: fall back to the content hash
+        if meta["sha256"] != self.content_hash():
+            return False
+        meta.update(stat)
+        self._write_meta(meta)
+        return True
+
+    def load(self):
+        """Return the cached DataFrame, or None if the cache is stale or unreadable."""
+        try:
+            if not self.is_valid():
+                return None
+            return pd.read_parquet(self.data_path)
+        except (ImportError, OSError, ValueError):
+            return None
+
+    def store(self, df):
+        """Write the DataFrame to the cache. Failures are ignored (cache is best effort)."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self.data_path}.tmp"
+            df.to_parquet(tmp_path, index=False)
+            os.replace(tmp_path, self.data_path)
+
+            meta = {"version": self.FORMAT_VERSION, "sha256": self.content_hash(), **self._stat()}
+            self._write_meta(meta)
+            return True
+        except (ImportError, OSError, ValueError):
+            return False
+
+    def clear(self):
+        """Remove the cached data and its metadata."""
+        for path in (self.data_path, self.meta_path):
+            if os.path.exists(path):
+                os.remove(path)
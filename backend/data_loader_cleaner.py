@@ -1,39 +1,294 @@
+import os
+import glob
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
+from backend.csv_cache import CsvCache
+from backend.dataset_profiler import DatasetProfiler
+from backend.feature_engineering import FeatureEngineering
+
+def _read_partition(file_path, compact=False, use_cache=True):
+    """Load one partition file with string columns as categoricals (runs in a worker process)."""
+    df = DataLoaderCleaner(use_cache=use_cache).load_data(file_path, compact=compact)
+    for col in df.select_dtypes(include='object').columns:
+        df[col] = df[col].astype('category')
+    return df
+
 
 class DataLoaderCleaner:
-    def __init__(self):
+    CATEGORICAL_COLUMNS = ['carrier', 'carrier_name', 'airport', 'airport_name']
+    COUNT_COLUMNS = ['arr_flights', 'arr_del15']
+
+    # Read-time dtypes for the BTS delay-cause columns (used with compact=True)
+    COMPACT_SCHEMA = {
+        'year': 'int16',
+        'month': 'int8',
+        'carrier': 'category',
+        'carrier_name': 'category',
+        'airport': 'category',
+        'airport_name': 'category',
+        'arr_flights': 'float32',
+        'arr_del15': 'float32',
+        'carrier_ct': 'float32',
+        'weather_ct': 'float32',
+        'nas_ct': 'float32',
+        'security_ct': 'float32',
+        'late_aircraft_ct': 'float32',
+        'arr_cancelled': 'float32',
+        'arr_diverted': 'float32',
+        'arr_delay': 'float32',
+        'carrier_delay': 'float32',
+        'weather_delay': 'float32',
+        'nas_delay': 'float32',
+        'security_delay': 'float32',
+        'late_aircraft_delay': 'float32',
+    }
+
+    def __init__(self, use_cache=True, lean=False):
         self.raw_df = None
         self.clean_df = None
         self.categorical_backup = None
+        self.use_cache = use_cache
+        self.lean = lean
+        self.comparison = None
+
+    def load_data(self, file_path, compact=False):
+        """
+        Load the CSV file and store raw DataFrame.
+
+        When `use_cache` is enabled, the parsed CSV is saved as Parquet in a
+        `.cache` folder next to the file and served from there on later loads,
+        as long as the CSV has not changed.
+
+        With `compact=True` the columns are parsed straight into the dtypes of
+        `COMPACT_SCHEMA` (small ints, categories, float32) instead of the
+        default int64/float64/object.
+        """
+        dtype = self.COMPACT_SCHEMA if compact else None
+        if not self.use_cache:
+            self.raw_df = pd.read_csv(file_path, dtype=dtype)
+            return self.raw_df
 
-    def load_data(self, file_path):
-        """Load the CSV file and store raw DataFrame."""
-        self.raw_df = pd.read_csv(file_path)
+        cache = CsvCache(file_path, variant="compact" if compact else "raw")
+        df = cache.load()
+        if df is None:
+            df = pd.read_csv(file_path, dtype=dtype)
+            cache.store(df)
+
+        self.raw_df = df
         return self.raw_df
 
     def clean_data(self, df):
-        """Clean the raw DataFrame and return cleaned version."""
-        df = df.copy()
+        """
+        Clean the raw DataFrame and return cleaned version.
+
+        In lean mode the input is not copied up front (the kept rows are
+        gathered column by column into a new frame), the categorical backup is
+        only built when requested and the instance releases its reference to
+        the raw frame.
+
+        The statistics used by `compare_raw_clean` are recorded here, so the
+        comparison stays available after the raw frame is released.
+        """
+        raw_shape = df.shape
+        if self.lean:
+            # Drop missing values and convert dtypes one column at a time,
+            # so only a single column is ever held twice
+            keep = np.ones(len(df), dtype=bool)
+            missing_before = 0
+            for col in df.columns:
+                nulls = df[col].isna().to_numpy()
+                missing_before += int(nulls.sum())
+                keep &= ~nulls
+            index = df.index[keep]
+            df = pd.DataFrame({
+                col: self._convert_column(col, pd.Series(df[col].array[keep], index=index, copy=False))
+                for col in df.columns
+            }, copy=False)
+        else:
+            df = df.copy()
+            missing_before = int(df.isna().sum().sum())
+
+            # Drop missing values
+            df.dropna(inplace=True)
+
+            # Convert to appropriate dtypes
+            df = self._convert_dtypes(df)
 
-        # Drop missing values
-        df.dropna(inplace=True)
+        if self.lean:
+            self.categorical_backup = None
+            self.raw_df = None
+        else:
+            # Backup categorical columns
+            self.categorical_backup = df[self.CATEGORICAL_COLUMNS].copy()
+
+        self.comparison = None
+        self._record_comparison(raw_shape, missing_before, df)
+
+        self.clean_df = df
+        return df
+
+    def _record_comparison(self, raw_shape, missing_before, clean_df):
+        """Add one cleaned batch to the raw-vs-clean statistics."""
+        stats = self.comparison or {
+            'raw_shape': (0, raw_shape[1]),
+            'clean_shape': (0, clean_df.shape[1]),
+            'missing_before': 0,
+            'missing_after': 0,
+            'dropped_rows': 0,
+        }
+        stats['raw_shape'] = (stats['raw_shape'][0] + raw_shape[0], raw_shape[1])
+        stats['clean_shape'] = (stats['clean_shape'][0] + clean_df.shape[0], clean_df.shape[1])
+        stats['missing_before'] += missing_before
+        stats['missing_after'] += int(clean_df.isna().sum().sum())
+        stats['dropped_rows'] = stats['raw_shape'][0] - stats['clean_shape'][0]
+        self.comparison = stats
+
+    def load_partitioned(self, path, max_workers=None, compact=False):
+        """
+        Load a dataset split into several CSV files (e.g. one per month/year).
 
-        # Convert to appropriate dtypes
-        cat_cols = ['carrier', 'carrier_name', 'airport', 'airport_name']
+        `path` is a directory (all `*.csv` files in it) or a glob pattern.
+        Files are parsed in a process pool, each through `load_data` so the
+        per-file cache is used. String columns come back as categoricals whose
+        categories are unified across partitions, so the partitions concatenate
+        without falling back to object dtype. Rows keep the sorted file order.
+        """
+        pattern = os.path.join(path, '*.csv') if os.path.isdir(path) else path
+        files = sorted(glob.glob(pattern))
+        if not files:
+            raise FileNotFoundError(f"No CSV files match '{path}'")
+
+        if max_workers == 1 or len(files) == 1:
+            parts = [_read_partition(f, compact, self.use_cache) for f in files]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                parts = list(pool.map(_read_partition, files, [compact] * len(files), [self.use_cache] * len(files)))
+
+        # Unify categorical dictionaries so concat keeps the category dtype. A string
+        # column with no values in some file is parsed as all-NaN float there; it
+        # joins the categorical too.
+        cat_cols = dict.fromkeys(col for part in parts for col in part.columns
+                                 if isinstance(part[col].dtype, pd.CategoricalDtype))
         for col in cat_cols:
-            if col in df.columns:
-                df[col] = df[col].astype('category')
+            categoricals = [part[col] for part in parts
+                            if col in part.columns and isinstance(part[col].dtype, pd.CategoricalDtype)]
+            categories = sorted(pd.api.types.union_categoricals(categoricals).categories)
+            for part in parts:
+                if col not in part.columns:
+                    continue
+                if isinstance(part[col].dtype, pd.CategoricalDtype):
+                    part[col] = part[col].cat.set_categories(categories)
+                elif part[col].isna().all():
+                    part[col] = part[col].astype(pd.CategoricalDtype(categories))
+
+        self.raw_df = pd.concat(parts, ignore_index=True, copy=False)
+        return self.raw_df
+
+    def _convert_dtypes(self, df, categories=None):
+        """
+        Cast categorical and count columns in place.
 
-        # Backup categorical columns
-        self.categorical_backup = df[cat_cols].copy()
+        `categories` maps a column to a fixed CategoricalDtype; other
+        categorical columns get their categories inferred from `df`.
+        """
+        categories = categories or {}
+        for col in self.CATEGORICAL_COLUMNS:
+            if col in df.columns:
+                df[col] = self._convert_column(col, df[col], categories)
 
         # Convert specific numeric columns
-        df['arr_flights'] = df['arr_flights'].astype(int)
-        df['arr_del15'] = df['arr_del15'].astype(int)
+        for col in self.COUNT_COLUMNS:
+            df[col] = self._convert_column(col, df[col])
 
-        self.clean_df = df
         return df
 
+    def _convert_column(self, col, series, categories=None):
+        """Return `series` cast to the cleaned dtype for column `col`."""
+        if col in self.CATEGORICAL_COLUMNS:
+            return series.astype((categories or {}).get(col, 'category'))
+        if col in self.COUNT_COLUMNS:
+            return series.astype(int)
+        return series
+
+    def scan_categories(self, file_path, chunksize=100_000):
+        """
+        Collect the sorted category values of the categorical columns in one
+        pass that only parses those columns.
+        """
+        values = {}
+        reader = pd.read_csv(file_path, usecols=lambda col: col in self.CATEGORICAL_COLUMNS, chunksize=chunksize)
+        for chunk in reader:
+            for col in chunk.columns:
+                values.setdefault(col, set()).update(chunk[col].dropna().unique())
+        return {col: sorted(vals) for col, vals in values.items()}
+
+    def iter_clean_chunks(self, file_path, chunksize=100_000, categories=None, compact=False):
+        """
+        Stream the CSV in chunks and yield each chunk cleaned like `clean_data`.
+
+        All chunks share the same categorical dtypes so they can be
+        concatenated or compared directly. Pass `categories` (column -> list of
+        values) to skip the extra scan done by `scan_categories`. Only the
+        running `compare_raw_clean` statistics are kept on the instance, so
+        memory stays bounded by the chunk size.
+        `compact=True` parses each chunk with `COMPACT_SCHEMA`.
+        """
+        if categories is None:
+            categories = self.scan_categories(file_path, chunksize=chunksize)
+        dtypes = {col: pd.CategoricalDtype(values) for col, values in categories.items()}
+        read_dtype = {**self.COMPACT_SCHEMA, **dtypes} if compact else None
+
+        self.comparison = None
+        for chunk in pd.read_csv(file_path, chunksize=chunksize, dtype=read_dtype):
+            raw_shape = chunk.shape
+            missing_before = int(chunk.isna().sum().sum())
+            chunk.dropna(inplace=True)
+            chunk = self._convert_dtypes(chunk, dtypes)
+            self._record_comparison(raw_shape, missing_before, chunk)
+            yield chunk
+
+    def append_data(self, file_path, store):
+        """
+        Ingest a new BTS release into a `ColumnStore` built with `build_stages`.
+
+        Only rows for (year, month) periods not already in the store are kept.
+        Those rows are cleaned and feature engineered on their own. Their group
+        sums are added to the stored group totals, and the group-level features
+        of the whole history are refreshed from those totals, so the history is
+        never re-parsed, re-cleaned or re-grouped.
+        Returns the number of appended raw rows.
+        """
+        raw_hist = store.load('raw')
+        source = store.read_schema('raw')['source']
+
+        new_raw = pd.read_csv(file_path)
+        hist_periods = np.unique(raw_hist['year'].to_numpy() * 100 + raw_hist['month'].to_numpy())
+        is_new = ~np.isin(new_raw['year'].to_numpy() * 100 + new_raw['month'].to_numpy(), hist_periods)
+        new_raw = new_raw[is_new]
+        if new_raw.empty:
+            return 0
+        new_raw.index = pd.RangeIndex(len(raw_hist), len(raw_hist) + len(new_raw))
+        self.raw_df = new_raw
+
+        new_clean = self.clean_data(new_raw)
+        engineer = FeatureEngineering()
+        new_fe = engineer.transform(new_clean)
+
+        totals = store.load_group_totals()
+        if totals is None:
+            totals = engineer.group_totals(store.load('fe'))
+        totals = engineer.merge_group_totals(totals, engineer.group_totals(new_fe))
+
+        fe_all = pd.concat([store.load('fe'), new_fe])
+        fe_all = engineer.apply_group_totals(fe_all, totals)
+
+        store.save('raw', pd.concat([raw_hist, new_raw]), source=source)
+        store.save('clean', pd.concat([store.load('clean'), new_clean]), source=source)
+        store.save('fe', fe_all, source=source)
+        store.save_group_totals(totals, source=source)
+        return len(new_raw)
+
     def summarize_missing(self, df):
         """Return summary of missing values per column."""
         missing = df.isna().sum()
@@ -70,8 +325,50 @@ class DataLoaderCleaner:
 
 
 
+    def profile_data(self, source, chunksize=100_000):
+        """
+        Profile a CSV path or a DataFrame in one chunked pass.
+
+        Returns the same keys as `summarize_overview` plus 'missing' and
+        'duplicates' (see `DatasetProfiler`); quantiles in 'describe' are
+        approximate on large inputs.
+        """
+        profiler = DatasetProfiler()
+        if isinstance(source, pd.DataFrame):
+            chunks = (source.iloc[start:start + chunksize] for start in range(0, len(source), chunksize))
+        else:
+            chunks = pd.read_csv(source, chunksize=chunksize)
+
+        for chunk in chunks:
+            profiler.update(chunk)
+        return profiler.summary()
+
+    def summarize_memory(self, before_df, after_df):
+        """
+        Compare per-column memory (deep) of two versions of the same data,
+        e.g. a default load against a compact one. Sizes are in MB.
+        """
+        before = before_df.memory_usage(deep=True, index=False) / 1024 ** 2
+        after = after_df.memory_usage(deep=True, index=False) / 1024 ** 2
+        report = pd.DataFrame({
+            'before_mb': before,
+            'after_mb': after,
+            'before_dtype': before_df.dtypes.astype(str),
+            'after_dtype': after_df.dtypes.astype(str),
+        })
+        report.loc['Total'] = [before.sum(), after.sum(), '', '']
+        report['saved_pct'] = (1 - report['after_mb'] / report['before_mb']) * 100
+        return report
+
     def compare_raw_clean(self):
-        """Return basic comparison between raw and cleaned DataFrames."""
+        """
+        Return basic comparison between raw and cleaned DataFrames.
+
+        Uses the statistics recorded while cleaning, so neither frame has to
+        be kept around; falls back to `raw_df`/`clean_df` otherwise.
+        """
+        if self.comparison is not None:
+            return dict(self.comparison)
         if self.raw_df is None or self.clean_df is None:
             return None
 
@@ -84,7 +381,9 @@ class DataLoaderCleaner:
         }
 
     def get_categorical_backup(self):
-        """Return the backup of categorical columns."""
+        """Return the backup of categorical columns (built on first request in lean mode)."""
+        if self.categorical_backup is None and self.clean_df is not None:
+            self.categorical_backup = self.clean_df[self.CATEGORICAL_COLUMNS].copy()
         return self.categorical_backup
 
 
@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+
+
+class DatasetProfiler:
+    """
+    Single-pass, chunk-mergeable dataset profiler.
+
+    Feed chunks with `update(chunk)` and read the result with `summary()`.
+    Per column it keeps counts, nulls, min/max and running mean/variance
+    (merged with Chan's formula), plus a fixed-size uniform sample for
+    approximate quantiles, so memory is O(columns) apart from the duplicate
+    check. Duplicate rows are counted from 64-bit row hashes, which costs
+    8 bytes per distinct row instead of a full `duplicated()` pass.
+    """
+
+    QUANTILES = (0.25, 0.5, 0.75)
+
+    def __init__(self, sample_size=10_000, seed=0):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.rows = 0
+        self.columns = None
+        self.dtypes = None
+        self.head = None
+        self.stats = {}
+        self.seen_hashes = np.empty(0, dtype=np.uint64)
+        self.duplicates = 0
+
+    def update(self, chunk: pd.DataFrame):
+        """Add one chunk of rows to the profile."""
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+            self.dtypes = chunk.dtypes.copy()
+            self.head = chunk.head()
+
+        self.rows += len(chunk)
+        for col in chunk.columns:
+            self._update_column(col, chunk[col])
+        self._update_duplicates(chunk)
+        return self
+
+    def _update_column(self, col, series):
+        stats = self.stats.setdefault(col, {'count': 0, 'nulls': 0, 'numeric': None})
+        non_null = series.dropna()
+        stats['count'] += len(non_null)
+        stats['nulls'] += len(series) - len(non_null)
+
+        # Dtypes are inferred per chunk: a column with no values in one chunk reads as
+        # float64 and may hold strings in the next, so any non-numeric chunk demotes it
+        numeric = pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+        if not numeric and stats['numeric']:
+            self.dtypes[col] = series.dtype
+        if stats['numeric'] is None or not numeric:
+            stats['numeric'] = numeric
+        if not stats['numeric'] or non_null.empty:
+            return
+
+        values = non_null.to_numpy(dtype=np.float64)
+        n_b = len(values)
+        mean_b = values.mean()
+        m2_b = ((values - mean_b) ** 2).sum()
+
+        n_a = stats.get('n', 0)
+        if n_a == 0:
+            stats.update(n=n_b, mean=mean_b, m2=m2_b, min=values.min(), max=values.max())
+        else:
+            n = n_a + n_b
+            delta = mean_b - stats['mean']
+            stats['mean'] += delta * n_b / n
+            stats['m2'] += m2_b + delta ** 2 * n_a * n_b / n
+            stats['n'] = n
+            stats['min'] = min(stats['min'], values.min())
+            stats['max'] = max(stats['max'], values.max())
+
+        # Bottom-k sample on random keys: a uniform sample that merges across chunks
+        keys = self.rng.random(n_b)
+        if 'sample' in stats:
+            keys = np.concatenate([stats['sample_keys'], keys])
+            values = np.concatenate([stats['sample'], values])
+        if len(values) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, values = keys[keep], values[keep]
+        stats['sample_keys'], stats['sample'] = keys, values
+
+    def _update_duplicates(self, chunk):
+        # read_csv infers dtypes per chunk (1 is int64 in one chunk, float64 in a
+        # chunk with NaN); hash numeric columns as float64 so equal rows match
+        numeric = {
+            col: chunk[col].astype(np.float64) for col in chunk.columns
+            if pd.api.types.is_numeric_dtype(chunk[col]) and not pd.api.types.is_bool_dtype(chunk[col])
+        }
+        hashes = pd.util.hash_pandas_object(chunk.assign(**numeric), index=False).to_numpy()
+        unique = np.unique(hashes)
+        self.duplicates += len(hashes) - len(unique)
+
+        pos = np.searchsorted(self.seen_hashes, unique)
+        inside = pos < len(self.seen_hashes)
+        already_seen = np.zeros(len(unique), dtype=bool)
+        already_seen[inside] = self.seen_hashes[pos[inside]] == unique[inside]
+        self.duplicates += int(already_seen.sum())
+        # Both arrays are sorted: insert the new hashes at their positions (a merge, no re-sort)
+        self.seen_hashes = np.insert(self.seen_hashes, pos[~already_seen], unique[~already_seen])
+
+    def describe(self):
+        """Return a `df.describe()`-shaped table for numeric columns (quantiles are approximate)."""
+        index = ['count', 'mean', 'std', 'min'] + [f"{int(q * 100)}%" for q in self.QUANTILES] + ['max']
+        table = {}
+        for col in self.columns or []:
+            stats = self.stats[col]
+            if not stats['numeric']:
+                continue
+            n = stats.get('n', 0)
+            if n == 0:
+                table[col] = [0.0] + [np.nan] * (len(index) - 1)
+                continue
+            std = np.sqrt(stats['m2'] / (n - 1)) if n > 1 else np.nan
+            quantiles = np.quantile(stats['sample'], self.QUANTILES)
+            table[col] = [float(n), stats['mean'], std, stats['min'], *quantiles, stats['max']]
+        return pd.DataFrame(table, index=index)
+
+    def missing(self):
+        """Missing values per column, like `DataLoaderCleaner.summarize_missing`."""
+        missing = pd.Series({col: self.stats[col]['nulls'] for col in self.columns or []}, dtype=int)
+        return missing[missing > 0].sort_values(ascending=False)
+
+    def summary(self):
+        """
+        Return the combined result of `summarize_overview`, `summarize_missing`
+        and `summarize_duplicates` from the single pass.
+        """
+        n_cols = len(self.columns or [])
+        summary = {
+            'shape': (self.rows, n_cols),
+            'rows': self.rows,
+            'columns': n_cols,
+            'dtypes': self.dtypes,
+            'describe': self.describe(),
+            'head': self.head,
+            'missing': self.missing(),
+            'duplicates': self.duplicates,
+            'year_range': None,
+            'time_span': None,
+        }
+
+        year = self.stats.get('year')
+        if year is not None and year['numeric'] and year.get('n', 0) > 0:
+            summary['year_range'] = (int(year['min']), int(year['max']))
+            summary['time_span'] = int(year['max'] - year['min'])
+
+        return summary
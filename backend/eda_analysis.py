@@ -210,7 +210,7 @@ class FlightDataAnalysis:
 
 
     def plot_dominant_delay_causes_count(self):
-        count = self.df['dominant_delay_cause'].value_counts().sort_values().reset_index()
+        count = self.df['dominant_delay_cause'].astype(object).value_counts().sort_values().reset_index()
         count.columns = ['Cause', 'Count']
         fig, ax = plt.subplots(figsize=(7, 4))
         sns.barplot(data=count, x='Cause', y='Count', ax=ax, palette="pastel")
@@ -1,7 +1,75 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
 import pandas as pd
 import numpy as np
 
 class FeatureEngineering:
+    # Months not listed here map to 'Fall', as in get_season
+    SEASON_BY_MONTH = {
+        12: 'Winter', 1: 'Winter', 2: 'Winter',
+        3: 'Spring', 4: 'Spring', 5: 'Spring',
+        6: 'Summer', 7: 'Summer', 8: 'Summer',
+    }
+
+    # Group-level features that depend on the whole dataset:
+    # feature -> (group key, numerator column, denominator column or None for a plain sum)
+    GROUP_FEATURES = {
+        'carrier_total_flights': ('carrier', 'arr_flights', None),
+        'airport_delay_rate': ('airport', 'arr_del15', 'arr_flights'),
+        'month_delay_rate': ('month', 'arr_del15', 'arr_flights'),
+        'season_airport_delay_rate': ('season_airport_combo', 'arr_del15', 'arr_flights'),
+    }
+
+    # Group keys made of several columns; aggregated from the codes of their parts
+    COMPOSITE_KEYS = {
+        'season_airport_combo': ('season', 'airport'),
+    }
+
+    DELAY_COLS = ['carrier_delay', 'weather_delay', 'nas_delay', 'security_delay', 'late_aircraft_delay']
+    DELAY_PCT_COLS = [col.replace('_delay', '_delay_pct') for col in DELAY_COLS]
+
+    # Feature dependency graph: feature -> engineered features / input columns it
+    # is computed from. Order is the output column order of transform. Names
+    # starting with '_' are internal nodes that are never returned.
+    # 'arr_flights' is the input column with 0 replaced by NaN.
+    FEATURE_DEPENDENCIES = {
+        'arr_flights': ['arr_flights'],
+        'delay_ratio': ['arr_del15', 'arr_flights'],
+        'cancellation_rate': ['arr_cancelled', 'arr_flights'],
+        'diversion_rate': ['arr_diverted', 'arr_flights'],
+        'disrupted': ['arr_del15', 'arr_cancelled'],
+        'total_delay': DELAY_COLS,
+        **{pct: [col, 'total_delay'] for col, pct in zip(DELAY_COLS, DELAY_PCT_COLS)},
+        'year_month': ['year', 'month'],
+        '_season': ['month'],
+        'season': ['_season'],
+        'carrier_total_flights': ['carrier', 'arr_flights'],
+        'airport_delay_rate': ['airport', 'arr_del15', 'arr_flights'],
+        'delay_risk_level': ['delay_ratio'],
+        'mean_delay_per_flight': ['total_delay', 'arr_flights'],
+        'dominant_delay_cause': DELAY_COLS,
+        'month_delay_rate': ['month', 'arr_del15', 'arr_flights'],
+        'carrier_vs_airport_ratio': ['carrier_delay_pct', 'weather_delay_pct', 'nas_delay_pct'],
+        'season_airport_combo': ['_season', 'airport'],
+        'season_airport_delay_rate': ['season_airport_combo', 'arr_del15', 'arr_flights'],
+    }
+
+    BACKENDS = ("pandas", "arrow")
+
+    def __init__(self, backend: str = "pandas", float_dtype=np.float64):
+        """
+        `backend` selects the execution engine of transform: 'pandas' or 'arrow' (pyarrow.compute).
+        `float_dtype` is the dtype of the engineered float columns; np.float32
+        halves their memory (features are still computed in float64).
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        if np.dtype(float_dtype) not in (np.float32, np.float64):
+            raise ValueError("float_dtype must be np.float32 or np.float64")
+        self.backend = backend
+        self.float_dtype = np.dtype(float_dtype)
+
     @staticmethod
     def get_season(month: int) -> str:
         """Map month to season."""
@@ -14,87 +82,498 @@ class FeatureEngineering:
         else:
             return 'Fall'
 
-    def transform(self, df: pd.DataFrame, fillna: bool = True) -> pd.DataFrame:
+    @classmethod
+    def get_seasons(cls, months: pd.Series, as_category: bool = False) -> pd.Series:
+        """
+        Vectorized get_season for a whole column (lookup table indexed by month).
+        With `as_category=True` the result is a categorical built from the
+        looked-up codes, which is cheaper to group on than strings.
+        """
+        labels = sorted(set(cls.SEASON_BY_MONTH.values()) | {'Fall'})
+        table = np.array([labels.index(cls.SEASON_BY_MONTH.get(m, 'Fall')) for m in range(13)], dtype=np.int8)
+        values = months.to_numpy(dtype=np.float64)
+        valid = (values >= 1) & (values <= 12) & (values == np.floor(values))
+        codes = table[np.where(valid, values, 0).astype(np.intp)]
+        if as_category:
+            return pd.Series(pd.Categorical.from_codes(codes, labels), index=months.index)
+        return pd.Series(np.array(labels, dtype=object)[codes], index=months.index)
+
+    @staticmethod
+    def combine_keys(parts: list, sep: str, formats: list = None) -> pd.Series:
+        """
+        Categorical equivalent of `parts[0].astype(str) + sep + parts[1].astype(str) ...`.
+
+        Rows are coded with integer arithmetic on the factorized parts; label
+        strings are only built for the distinct combinations (the categories),
+        so no per-row string is allocated. `formats` optionally holds a
+        function per part applied to its string labels (e.g. zero padding).
+        Categories are ordered by the sorted values of the parts.
+        """
+        index = parts[0].index
+        codes = np.zeros(len(index), dtype=np.int64)
+        part_uniques = []
+        for part in parts:
+            part_codes, uniques = pd.factorize(part, sort=True, use_na_sentinel=False)
+            codes = codes * len(uniques) + part_codes
+            part_uniques.append(uniques)
+
+        combo_codes, combos = pd.factorize(codes, sort=True)
+
+        # Decode each distinct combination back into its parts to build the labels
+        labels = None
+        remainder = np.asarray(combos)
+        for i in reversed(range(len(parts))):
+            uniques = part_uniques[i]
+            part_labels = pd.Series(np.asarray(uniques.take(remainder % len(uniques)), dtype=object)).astype(str)
+            if formats and formats[i] is not None:
+                part_labels = formats[i](part_labels)
+            labels = part_labels if labels is None else part_labels + sep + labels
+            remainder = remainder // len(uniques)
+
+        categories = labels if labels is not None else []
+        return pd.Series(pd.Categorical.from_codes(combo_codes, categories), index=index)
+
+    @staticmethod
+    def classify_risk(ratio):
+        """Map a delay ratio to a risk level: 0 (<= 20%), 1 (<= 40%), 2 (> 40%)."""
+        if pd.isna(ratio):
+            return np.nan
+        elif ratio <= 0.20:
+            return 0
+        elif ratio <= 0.40:
+            return 1
+        else:
+            return 2
+
+    @staticmethod
+    def classify_risk_levels(ratios: pd.Series) -> pd.Series:
+        """
+        Vectorized classify_risk for a whole column. Like the row-wise version,
+        the result is int64 when there are no missing ratios and float64 otherwise.
+        """
+        levels = np.select([ratios <= 0.20, ratios <= 0.40], [0, 1], default=2)
+        missing = ratios.isna().to_numpy()
+        if not missing.any():
+            return pd.Series(levels, index=ratios.index, dtype='int64')
+        return pd.Series(np.where(missing, np.nan, levels), index=ratios.index)
+
+    @staticmethod
+    def restore_int_sum(values: np.ndarray, source_dtype) -> np.ndarray:
+        """
+        Cast plain group sums back to the integer dtype of the summed column,
+        as `groupby(...).transform('sum')` returns them, unless a row has no
+        group (NaN). Sums of float columns are returned as they are.
+        """
+        if pd.api.types.is_integer_dtype(source_dtype) and not np.isnan(values).any():
+            return values.astype(source_dtype)
+        return values
+
+    @staticmethod
+    def dominant_causes(delays: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized `delays.idxmax(axis=1)` returned as a categorical of the
+        column names. Same semantics: NaN is skipped, ties (including all-zero
+        rows) go to the first column, all-NaN rows give NaN.
+        """
+        values = delays.to_numpy(dtype=np.float64)
+        missing = np.isnan(values)
+        codes = np.where(missing, -np.inf, values).argmax(axis=1)
+        codes[missing.all(axis=1)] = -1
+        return pd.Series(pd.Categorical.from_codes(codes, categories=list(delays.columns)), index=delays.index)
+
+    def transform(self, df: pd.DataFrame, fillna: bool = True, group_totals: dict = None,
+                  columns: list = None, n_jobs: int = None) -> pd.DataFrame:
         """
         Feature engineering pipeline for flight delay data.
         - Generates delay-related ratios
         - Adds seasonal and airport-level features
         - Avoids groupby.apply-related issues
         - Keeps dtype consistency for modeling
+
+        If `group_totals` (see `group_totals()` / `GroupFeatureStore`) is
+        given, the group-level features are looked up from those historical
+        totals instead of being aggregated over `df` itself.
+
+        By default all input columns plus every engineered feature are
+        returned. Pass `columns` to get only those columns (engineered or
+        input); then only the features they depend on are computed.
+
+        `n_jobs` > 1 (or -1 for all cores) splits the rows across a process
+        pool, see `transform_parallel`. The output is the same as serial.
+        With the 'arrow' backend the features are computed by `ArrowFeatures`.
         """
-        df = df.copy()
+        if columns is None:
+            columns = list(df.columns) + [name for name in self.output_features() if name not in df.columns]
+        if self.backend == "arrow":
+            if n_jobs is not None and n_jobs != 1:
+                raise ValueError("n_jobs is only supported by the pandas backend")
+            from backend.arrow_backend import ArrowFeatures
+            return ArrowFeatures(self).transform(df, fillna=fillna, group_totals=group_totals, columns=columns)
+        if n_jobs is not None and n_jobs != 1:
+            return self.transform_parallel(df, fillna=fillna, group_totals=group_totals, columns=columns, n_jobs=n_jobs)
+        features = LazyFeatures(self, df, fillna=fillna, group_totals=group_totals)
+        return features.frame(columns)
 
-        # ➤ Handle arr_flights = 0 to prevent division errors
-        df['arr_flights'] = df['arr_flights'].replace(0, np.nan)
+    def transform_parallel(self, df: pd.DataFrame, fillna: bool = True, group_totals: dict = None,
+                           columns: list = None, n_jobs: int = -1) -> pd.DataFrame:
+        """
+        Partitioned `transform` over a process pool.
 
-        # ➤ Delay ratios and rates
-        df['delay_ratio'] = df['arr_del15'] / df['arr_flights']
-        df['cancellation_rate'] = df['arr_cancelled'] / df['arr_flights']
-        df['diversion_rate'] = df['arr_diverted'] / df['arr_flights']
-        df['disrupted'] = ((df['arr_del15'] > 0) | (df['arr_cancelled'] > 0)).astype(int)
+        Rows are split into one contiguous partition per worker. Each worker
+        computes the row-local features of its partition plus its partial
+        group totals (sums of arr_del15 / arr_flights per key). The partial
+        totals are added together and the group-level features are looked up
+        from the merged totals, so they cover the whole frame as in the
+        serial version.
+        """
+        workers = os.cpu_count() if n_jobs is None or n_jobs < 0 else n_jobs
+        if columns is None:
+            columns = list(df.columns) + [name for name in self.output_features() if name not in df.columns]
 
+        group_needed = [feature for feature in self.GROUP_FEATURES if feature in columns]
+        local_columns = [col for col in columns if col not in self.GROUP_FEATURES]
+        if group_needed:
+            # Key and sum columns are needed to build (or look up) the group totals
+            extra = [self.GROUP_FEATURES[feature][0] for feature in group_needed] + ['arr_del15', 'arr_flights']
+            local_columns += [col for col in dict.fromkeys(extra) if col not in local_columns]
+        partial = group_needed if group_totals is None else None
 
-        # ➤ Total delay and individual delay percentages
-        delay_cols = ['carrier_delay', 'weather_delay', 'nas_delay', 'security_delay', 'late_aircraft_delay']
-        df['total_delay'] = df[delay_cols].sum(axis=1).replace(0, np.nan)
+        bounds = np.linspace(0, len(df), workers + 1).astype(int)
+        parts = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+        n_parts = len(parts)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_transform_partition, parts, [fillna] * n_parts,
+                                    [local_columns] * n_parts, [partial] * n_parts))
+        frames = [frame for frame, _ in results]
 
-        for col in delay_cols:
-            new_col = col.replace('_delay', '_delay_pct')
-            df[new_col] = df[col] / df['total_delay']
+        # Unify categorical dictionaries so concat keeps the category dtype
+        for col in local_columns:
+            if isinstance(frames[0][col].dtype, pd.CategoricalDtype) and any(
+                    frame[col].dtype != frames[0][col].dtype for frame in frames):
+                categories = sorted(pd.api.types.union_categoricals([frame[col] for frame in frames]).categories)
+                for frame in frames:
+                    frame[col] = frame[col].cat.set_categories(categories)
+        frame = pd.concat(frames, copy=False)
 
-        if fillna:
-            pct_cols = [col.replace('_delay', '_delay_pct') for col in delay_cols]
-            df[pct_cols] = df[pct_cols].fillna(0)
+        group = {}
+        if group_needed:
+            totals = group_totals
+            if totals is None:
+                totals = reduce(self.merge_group_totals, [totals for _, totals in results])
+            group = self.group_features(frame, totals, features=group_needed)
+            if fillna:
+                group = {feature: values.fillna(0) for feature, values in group.items()}
 
-        # ➤ Time-based features
-        df['year_month'] = df['year'].astype(str) + '-' + df['month'].astype(str).str.zfill(2)
-        df['season'] = df['month'].apply(self.get_season)
+        return pd.DataFrame({col: self.cast_output(col, group[col] if col in group else frame[col]) for col in columns},
+                            index=frame.index, copy=False)
 
-        # ➤ Group-level aggregated features
-        # carrier_total_flights: must pre-fill NaNs to avoid errors
-        df['carrier_total_flights'] = df.groupby('carrier', observed=False)['arr_flights'].transform('sum')
+    def lazy(self, df: pd.DataFrame, fillna: bool = True, group_totals: dict = None) -> 'LazyFeatures':
+        """Return a LazyFeatures view that computes and caches features on request."""
+        return LazyFeatures(self, df, fillna=fillna, group_totals=group_totals)
+
+    def cast_output(self, name: str, values: pd.Series) -> pd.Series:
+        """
+        Cast an engineered float column to `float_dtype`. Input columns are left
+        as they are, including 'arr_flights', which depends only on itself: it
+        passes the input column through (zeros as NaN) and keeps its dtype.
+        """
+        if name not in self.FEATURE_DEPENDENCIES or self.FEATURE_DEPENDENCIES[name] == [name]:
+            return values
+        if values.dtype == np.float64 and self.float_dtype != np.float64:
+            return values.astype(self.float_dtype)
+        return values
+
+    @classmethod
+    def output_features(cls) -> list:
+        """Engineered features in output order (internal '_' nodes excluded)."""
+        return [name for name in cls.FEATURE_DEPENDENCIES if not name.startswith('_')]
+
+    @classmethod
+    def required_features(cls, columns: list) -> list:
+        """
+        Return the engineered features (including internal nodes) needed to
+        produce `columns`, in dependency order. Input columns are not listed.
+        """
+        ordered = []
+
+        def visit(name):
+            if name in ordered or name not in cls.FEATURE_DEPENDENCIES:
+                return
+            for dep in cls.FEATURE_DEPENDENCIES[name]:
+                if dep != name:
+                    visit(dep)
+            ordered.append(name)
+
+        for name in columns:
+            visit(name)
+        return ordered
+
+    def compute_feature(self, name: str, features: 'LazyFeatures') -> pd.Series:
+        """
+        Compute one node of FEATURE_DEPENDENCIES from its dependencies, which
+        are read through `features` (and so computed on demand and cached).
+        Values are returned before the final NaN fill.
+        """
+        get = features.get
+        fillna = features.fillna
+
+        # ➤ Handle arr_flights = 0 to prevent division errors
+        if name == 'arr_flights':
+            return features.df['arr_flights'].replace(0, np.nan)
+
+        # ➤ Delay ratios and rates
+        if name == 'delay_ratio':
+            return get('arr_del15') / get('arr_flights')
+        if name == 'cancellation_rate':
+            return get('arr_cancelled') / get('arr_flights')
+        if name == 'diversion_rate':
+            return get('arr_diverted') / get('arr_flights')
+        if name == 'disrupted':
+            return ((get('arr_del15') > 0) | (get('arr_cancelled') > 0)).astype(int)
+
+        # ➤ Total delay and individual delay percentages
+        if name == 'total_delay':
+            return features.df[self.DELAY_COLS].sum(axis=1).replace(0, np.nan)
+        if name in self.DELAY_PCT_COLS:
+            pct = get(name.replace('_delay_pct', '_delay')) / get('total_delay')
+            return pct.fillna(0) if fillna else pct
 
-        airport_delay_sum = df.groupby('airport', observed=False)['arr_del15'].transform('sum')
-        airport_flights_sum = df.groupby('airport', observed=False)['arr_flights'].transform('sum')
-        df['airport_delay_rate'] = airport_delay_sum / airport_flights_sum
+        # ➤ Time-based features (categorical 'YYYY-MM', built from integer codes)
+        if name == 'year_month':
+            return self.combine_keys([get('year'), get('month')], '-', formats=[None, lambda s: s.str.zfill(2)])
+        if name == '_season':
+            return self.get_seasons(get('month'), as_category=True)
+        if name == 'season':
+            return get('_season').astype(object)
+
+        # ➤ Group-level aggregated features
+        if name in self.GROUP_FEATURES:
+            return features.group_feature(name)
 
         # ➤ Label: delay_risk_level
-        def classify_risk(ratio):
-            if pd.isna(ratio):
-                return np.nan
-            elif ratio <= 0.20:
-                return 0
-            elif ratio <= 0.40:
-                return 1
-            else:
-                return 2
-        df['delay_risk_level'] = df['delay_ratio'].apply(classify_risk)
+        if name == 'delay_risk_level':
+            return self.classify_risk_levels(get('delay_ratio'))
 
         # ➤ Additional features
-        df['mean_delay_per_flight'] = df['total_delay'] / df['arr_flights']
-        df['mean_delay_per_flight'] = df['mean_delay_per_flight'].fillna(0)
+        if name == 'mean_delay_per_flight':
+            return (get('total_delay') / get('arr_flights')).fillna(0)
+        if name == 'dominant_delay_cause':
+            return self.dominant_causes(features.df[self.DELAY_COLS])
+
+        # Carrier vs airport pressure
+        if name == 'carrier_vs_airport_ratio':
+            return get('carrier_delay_pct') / (get('weather_delay_pct') + get('nas_delay_pct') + 1e-6)
 
-        df['dominant_delay_cause'] = df[delay_cols].idxmax(axis=1)
+        # Combo feature: season + airport (categorical 'Season_AIRPORT')
+        if name == 'season_airport_combo':
+            return self.combine_keys([get('_season'), get('airport')], '_')
 
-        # Monthly delay patterns
-        month_delay_sum = df.groupby('month', observed=False)['arr_del15'].transform('sum')
-        month_flights_sum = df.groupby('month', observed=False)['arr_flights'].transform('sum')
-        df['month_delay_rate'] = month_delay_sum / month_flights_sum
+        raise KeyError(f"Unknown feature '{name}'")
 
-        # Carrier vs airport pressure
-        df['carrier_vs_airport_ratio'] = df['carrier_delay_pct'] / (
-            df['weather_delay_pct'] + df['nas_delay_pct'] + 1e-6
-        )
+    def group_features(self, df: pd.DataFrame, group_totals: dict = None, keys: dict = None,
+                       features: list = None) -> dict:
+        """
+        Compute the GROUP_FEATURES columns of `df` (all, or those listed in
+        `features`) in one pass.
+
+        Each key column is factorized once (composite keys combine the codes of
+        their parts arithmetically), every needed sum is taken with a single
+        `np.bincount` per key and value column, and the group sums are
+        broadcast back to the rows. Matches `groupby(key).transform('sum')`:
+        NaN values are skipped and rows with a missing key get NaN.
+
+        `keys` supplies key columns that are not (yet) in `df`. With
+        `group_totals` the features are looked up from historical totals instead.
+        """
+        keys = keys or {}
+        features = features or list(self.GROUP_FEATURES)
+        if group_totals is not None:
+            return {
+                feature: self.lookup_group_feature(df, feature, group_totals, keys)
+                for feature in features
+            }
+
+        codes_cache = {}
+        weights_cache = {}
+        sums_cache = {}
+
+        def factorize(key, keep_na=False):
+            # Parts of a composite key keep NaN as a value of its own, like the
+            # 'Season_nan' labels of combine_keys; plain keys send NaN to -1
+            if (key, keep_na) not in codes_cache:
+                if key in self.COMPOSITE_KEYS:
+                    codes, size = np.zeros(len(df), dtype=np.int64), 1
+                    for part in self.COMPOSITE_KEYS[key]:
+                        part_codes, part_size = factorize(part, keep_na=True)
+                        codes = codes * part_size + part_codes
+                        size *= part_size
+                else:
+                    codes, uniques = pd.factorize(keys[key] if key in keys else df[key], use_na_sentinel=not keep_na)
+                    size = len(uniques)
+                codes_cache[(key, keep_na)] = (codes, size)
+            return codes_cache[(key, keep_na)]
+
+        def group_sum(key, col):
+            if (key, col) not in sums_cache:
+                codes, size = factorize(key)
+                if col not in weights_cache:
+                    weights_cache[col] = np.nan_to_num(df[col].to_numpy(dtype=np.float64), nan=0.0)
+                weights = weights_cache[col]
+                if len(codes) and codes.min() < 0:
+                    valid = codes >= 0
+                    codes, weights = codes[valid], weights[valid]
+                sums_cache[(key, col)] = np.bincount(codes, weights=weights, minlength=size)
+            return sums_cache[(key, col)]
 
-        # Combo feature: season + airport
-        df['season_airport_combo'] = df['season'].astype(str) + '_' + df['airport'].astype(str)
-        combo_del15 = df.groupby('season_airport_combo', observed=False)['arr_del15'].transform('sum')
-        combo_flights = df.groupby('season_airport_combo', observed=False)['arr_flights'].transform('sum')
-        df['season_airport_delay_rate'] = combo_del15 / combo_flights
+        results = {}
+        for feature in features:
+            key, numerator, denominator = self.GROUP_FEATURES[feature]
+            values = group_sum(key, numerator)
+            if denominator is not None:
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    values = values / group_sum(key, denominator)
 
-        # Fill remaining NaNs in numerical columns
-        if fillna:
-            num_cols = df.select_dtypes(include=[np.number]).columns
-            df[num_cols] = df[num_cols].fillna(0)
+            # Broadcast the per-group values back to the rows (bincount of no rows is int64)
+            codes, _ = factorize(key)
+            row_values = values.astype(np.float64)[codes]
+            row_values[codes < 0] = np.nan
+            if denominator is None:
+                row_values = self.restore_int_sum(row_values, df[numerator].dtype)
+            results[feature] = pd.Series(row_values, index=df.index)
+        return results
 
+    def lookup_group_feature(self, df: pd.DataFrame, feature: str, totals: dict, keys: dict = None) -> pd.Series:
+        """
+        Map each row's group key to the feature value derived from `totals`.
+        Unknown keys get 0 for plain sums and NaN for rates; rows with a
+        missing key get NaN, as with groupby.
+        """
+        key, numerator, denominator = self.GROUP_FEATURES[feature]
+        key_values = keys[key] if keys and key in keys else df[key]
+        sums = totals[key]
+        positions = sums.index.get_indexer(key_values.astype(object))
+        unknown = positions == -1
+
+        num = sums[numerator].to_numpy()[positions]
+        if denominator is None:
+            values = np.where(unknown, 0.0, num)
+            values[key_values.isna().to_numpy()] = np.nan
+            if numerator in df:
+                values = self.restore_int_sum(values, df[numerator].dtype)
+            return pd.Series(values, index=df.index)
+        den = sums[denominator].to_numpy()[positions]
+        rate = pd.Series(num, index=df.index) / pd.Series(den, index=df.index)
+        rate[unknown] = np.nan
+        return rate
+
+    def group_totals(self, df: pd.DataFrame, features: list = None) -> dict:
+        """
+        Sum `arr_del15` and `arr_flights` per group key of a transformed frame
+        (for the keys of all GROUP_FEATURES, or only those of `features`).
+        Returns {key column: DataFrame indexed by key value}.
+        """
+        totals = {}
+        for feature in features or self.GROUP_FEATURES:
+            key = self.GROUP_FEATURES[feature][0]
+            if key not in totals:
+                sums = df.groupby(key, observed=True)[['arr_del15', 'arr_flights']].sum()
+                sums.index = sums.index.astype(object)
+                totals[key] = sums
+        return totals
+
+    @staticmethod
+    def merge_group_totals(totals: dict, new_totals: dict) -> dict:
+        """Add two sets of group totals together (for incremental updates)."""
+        return {
+            key: totals[key].add(new_totals[key], fill_value=0) if key in totals else new_totals[key]
+            for key in new_totals
+        }
+
+    def apply_group_totals(self, df: pd.DataFrame, totals: dict, fillna: bool = True) -> pd.DataFrame:
+        """
+        Overwrite the group-level features of a transformed frame using
+        precomputed totals instead of grouping `df` itself.
+        """
+        for feature in self.GROUP_FEATURES:
+            values = self.lookup_group_feature(df, feature, totals)
+            df[feature] = values.fillna(0) if fillna else values
         return df
+
+
+class LazyFeatures:
+    """
+    Demand-driven view of the engineered features of one input frame.
+
+    Features are computed the first time they (or a feature depending on
+    them) are requested, following `FeatureEngineering.FEATURE_DEPENDENCIES`,
+    and cached for later requests. Values in the cache are kept before the
+    final NaN fill, which is applied when columns are handed out.
+    """
+
+    def __init__(self, engineer: FeatureEngineering, df: pd.DataFrame, fillna: bool = True, group_totals: dict = None):
+        self.engineer = engineer
+        self.df = df
+        self.fillna = fillna
+        self.group_totals = group_totals
+        self.cache = {}
+        self.pending_group_features = list(engineer.GROUP_FEATURES)
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        return self.column(name)
+
+    def request(self, columns: list) -> 'LazyFeatures':
+        """Declare the columns that will be read, so only the group features they need are built."""
+        needed = self.engineer.required_features(columns)
+        self.pending_group_features = [f for f in self.pending_group_features if f in needed]
+        return self
+
+    def get(self, name: str) -> pd.Series:
+        """Return a feature (computing it and its ancestors if needed) or an input column."""
+        if name in self.cache:
+            return self.cache[name]
+        if name not in self.engineer.FEATURE_DEPENDENCIES:
+            return self.df[name]
+        value = self.engineer.compute_feature(name, self)
+        value.name = name
+        self.cache[name] = value
+        return value
+
+    def group_feature(self, name: str) -> pd.Series:
+        """Compute all pending group features together so key factorization is shared."""
+        if name not in self.cache:
+            if name not in self.pending_group_features:
+                self.pending_group_features.append(name)
+            key_names = set()
+            for feature in self.pending_group_features:
+                key = self.engineer.GROUP_FEATURES[feature][0]
+                key_names.update([key, *self.engineer.COMPOSITE_KEYS.get(key, ())])
+            # Use the categorical season (cheap to factorize) instead of its object copy
+            keys = {key: self.get('_season' if key == 'season' else key) for key in key_names}
+            sums = pd.DataFrame({col: self.get(col) for col in ('arr_del15', 'arr_flights')}, copy=False)
+            self.cache.update(self.engineer.group_features(sums, self.group_totals, keys=keys,
+                                                           features=self.pending_group_features))
+            self.pending_group_features = []
+        return self.cache[name]
+
+    def column(self, name: str) -> pd.Series:
+        """Return a column as it appears in transform output (with the final NaN fill)."""
+        value = self.get(name)
+        if self.fillna and pd.api.types.is_numeric_dtype(value) and not pd.api.types.is_bool_dtype(value):
+            value = value.fillna(0)
+        return self.engineer.cast_output(name, value)
+
+    def frame(self, columns: list) -> pd.DataFrame:
+        """Return the requested columns as a new DataFrame, computing only what they need."""
+        self.request(columns)
+        return pd.DataFrame({name: self.column(name) for name in columns}, index=self.df.index)
+
+
+def _transform_partition(part, fillna, columns, group_features):
+    """Worker for `transform_parallel`: row-local features and partial group totals of one partition."""
+    engineer = FeatureEngineering()
+    frame = engineer.lazy(part, fillna=fillna).frame(columns)
+    totals = engineer.group_totals(frame, features=group_features) if group_features else None
+    return frame, totals
@@ -0,0 +1,156 @@
+import json
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from scipy import sparse
+
+
+class FeatureMatrixBuilder:
+    """
+    Writes model inputs straight into the model's feature matrix.
+
+    Compiled once from a fitted StandardScaler, OneHotEncoder and the model's
+    `expected_features`: each scaled column and each one-hot category gets its
+    column position in the output. `build()` then fills a preallocated array
+    in `expected_features` order, giving the same values as `preprocess`
+    (scale, one-hot, concat, reindex) without the intermediate DataFrames.
+    Features that neither transformer produces stay 0, like `reindex(fill_value=0)`.
+
+    `build_sparse()` produces the same matrix as CSR, storing only the scaled
+    columns and the one-hot 1s. XGBoost reads entries missing from a CSR
+    matrix as missing values, not 0, so sparse input must be scored with
+    `sparse_booster()`.
+    """
+
+    def __init__(self, encoder, scaler, expected_features, dtype=np.float32):
+        self.expected_features = list(expected_features)
+        self.dtype = dtype
+        positions = {name: i for i, name in enumerate(self.expected_features)}
+
+        # Scaled numeric columns: (column, output position), same math as scaler.transform
+        self.num_cols = list(scaler.feature_names_in_)
+        self.num_positions = [positions.get(col, -1) for col in self.num_cols]
+        self.mean = scaler.mean_ if scaler.with_mean else np.zeros(len(self.num_cols))
+        self.scale = scaler.scale_ if scaler.with_std else np.ones(len(self.num_cols))
+
+        # One-hot columns: category -> output position (-1 if the model does not use it)
+        self.cat_cols = list(encoder.feature_names_in_)
+        self.cat_plans = []
+        names_out = iter(encoder.get_feature_names_out(self.cat_cols))
+        for categories in encoder.categories_:
+            categories = pd.Index(categories)
+            category_positions = np.array([positions.get(next(names_out), -1) for _ in categories], dtype=np.int64)
+            self.cat_plans.append((categories, category_positions))
+
+        # Single-record lookups for build_one: string value -> output position
+        self.num_used = np.array([position >= 0 for position in self.num_positions])
+        self.num_targets = np.array(self.num_positions)[self.num_used]
+        self.cat_lookups = [
+            {str(category): int(position) for category, position in zip(categories, category_positions) if position >= 0}
+            for categories, category_positions in self.cat_plans
+        ]
+
+    @property
+    def input_columns(self):
+        """Columns `build()` reads from its input."""
+        return self.num_cols + self.cat_cols
+
+    def category_indices(self, categories, values):
+        """Index of each value in the encoder's categories (-1 for unknown or missing)."""
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Map the (few) categories once, then broadcast through the codes
+            mapping = np.append(categories.get_indexer(values.cat.categories.astype(str)), -1)
+            return mapping[values.cat.codes.to_numpy()]
+        return categories.get_indexer(values)
+
+    def build(self, features, dtype=None):
+        """
+        Return the feature matrix for `features` (a DataFrame or LazyFeatures
+        holding at least `input_columns`), in `dtype` if given.
+        """
+        n_rows = len(features)
+        matrix = np.zeros((n_rows, len(self.expected_features)), dtype=self.dtype if dtype is None else dtype)
+
+        for i, (col, position) in enumerate(zip(self.num_cols, self.num_positions)):
+            if position < 0:
+                continue
+            values = features[col].to_numpy(dtype=np.float64)
+            matrix[:, position] = (values - self.mean[i]) / self.scale[i]
+
+        rows = np.arange(n_rows)
+        for col, (categories, category_positions) in zip(self.cat_cols, self.cat_plans):
+            indices = self.category_indices(categories, features[col])
+            known = indices >= 0
+            columns = category_positions[indices[known]]
+            used = columns >= 0
+            matrix[rows[known][used], columns[used]] = 1
+
+        return matrix
+
+    def build_one(self, features, dtype=None):
+        """
+        One-row version of `build()` for a single record given as a dict of
+        feature values (e.g. from `RecordFeatures.compute`), using dict
+        lookups instead of pandas. Returns a (1, n_features) array.
+        """
+        row = np.zeros((1, len(self.expected_features)), dtype=self.dtype if dtype is None else dtype)
+        values = np.array([features[col] for col in self.num_cols], dtype=np.float64)
+        row[0, self.num_targets] = ((values - self.mean) / self.scale)[self.num_used]
+        for col, lookup in zip(self.cat_cols, self.cat_lookups):
+            position = lookup.get(str(features[col]), -1)
+            if position >= 0:
+                row[0, position] = 1
+        return row
+
+    def build_sparse(self, features, dtype=None):
+        """
+        CSR version of `build()`: scaled columns are stored explicitly (zeros
+        included) and each one-hot group stores only its 1, so a row holds
+        about as many entries as there are encoder/scaler inputs.
+        """
+        n_rows = len(features)
+        columns, values = [], []
+        for i, (col, position) in enumerate(zip(self.num_cols, self.num_positions)):
+            if position < 0:
+                continue
+            columns.append(np.full(n_rows, position, dtype=np.int64))
+            values.append((features[col].to_numpy(dtype=np.float64) - self.mean[i]) / self.scale[i])
+
+        for col, (categories, category_positions) in zip(self.cat_cols, self.cat_plans):
+            indices = self.category_indices(categories, features[col])
+            # Unknown categories (and categories the model does not use) store nothing
+            columns.append(np.where(indices >= 0, category_positions[indices], -1))
+            values.append(np.ones(n_rows))
+
+        columns = np.column_stack(columns) if columns else np.empty((n_rows, 0), dtype=np.int64)
+        values = np.column_stack(values) if values else np.empty((n_rows, 0))
+        order = np.argsort(columns, axis=1, kind='stable')
+        columns = np.take_along_axis(columns, order, axis=1)
+        values = np.take_along_axis(values, order, axis=1)
+
+        stored = columns >= 0
+        indptr = np.concatenate([[0], np.cumsum(stored.sum(axis=1))])
+        return sparse.csr_matrix(
+            (values[stored].astype(self.dtype if dtype is None else dtype), columns[stored], indptr),
+            shape=(n_rows, len(self.expected_features)),
+        )
+
+    def sparse_booster(self, booster):
+        """
+        Copy of `booster` that scores `build_sparse()` output like the dense matrix.
+
+        A one-hot column that is absent from a CSR row is read as missing, so
+        the copy sends missing values on one-hot splits the way a 0 goes
+        (left when 0 < split condition). The model was trained on dense
+        inputs without missing values, so dense predictions are unchanged.
+        """
+        onehot = {int(position) for _, positions in self.cat_plans for position in positions if position >= 0}
+        model = json.loads(booster.save_raw('json'))
+        for tree in model['learner']['gradient_booster']['model']['trees']:
+            for node, feature in enumerate(tree['split_indices']):
+                if tree['left_children'][node] != -1 and feature in onehot:
+                    tree['default_left'][node] = int(0 < tree['split_conditions'][node])
+
+        patched = xgb.Booster()
+        patched.load_model(bytearray(json.dumps(model).encode()))
+        return patched
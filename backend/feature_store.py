@@ -0,0 +1,70 @@
+import os
+import joblib
+import numpy as np
+from backend.feature_engineering import FeatureEngineering
+
+
+class GroupFeatureStore:
+    """
+    Precomputed historical group statistics for inference.
+
+    Holds the per-group sums of `arr_del15` and `arr_flights` behind the
+    group-level features (`FeatureEngineering.GROUP_FEATURES`), computed once
+    from the historical dataset. At inference time the features of a small
+    batch are looked up from these totals instead of being aggregated over
+    the batch itself, so they no longer depend on what else is in the batch.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "..", "models", "group_stats.pkl")
+
+    def __init__(self, totals=None):
+        self.totals = totals or {}
+        self._lookup = None
+
+    @classmethod
+    def build(cls, clean_df):
+        """Build the store from the cleaned historical dataset."""
+        engineer = FeatureEngineering()
+        return cls(engineer.group_totals(engineer.transform(clean_df)))
+
+    def update(self, clean_df):
+        """Add newly arrived cleaned rows to the totals (incremental update)."""
+        engineer = FeatureEngineering()
+        new_totals = engineer.group_totals(engineer.transform(clean_df))
+        self.totals = engineer.merge_group_totals(self.totals, new_totals)
+        self._lookup = None
+        return self
+
+    def save(self, path=None):
+        joblib.dump(self.totals, path or self.DEFAULT_PATH)
+
+    @classmethod
+    def load(cls, path=None):
+        return cls(joblib.load(path or cls.DEFAULT_PATH))
+
+    def lookup(self, feature, key_value):
+        """
+        Return a single group feature for one key value with a dict lookup,
+        e.g. lookup('airport_delay_rate', 'JFK'). Unknown keys give 0 for
+        plain sums and NaN for rates.
+        """
+        if self._lookup is None:
+            self._lookup = {
+                key: dict(zip(sums.index, sums[['arr_del15', 'arr_flights']].to_numpy().tolist()))
+                for key, sums in self.totals.items()
+            }
+
+        key, numerator, denominator = FeatureEngineering.GROUP_FEATURES[feature]
+        sums = self._lookup[key].get(key_value)
+        if sums is None:
+            return 0.0 if denominator is None else np.nan
+        values = dict(zip(['arr_del15', 'arr_flights'], sums))
+        if denominator is None:
+            return values[numerator]
+        if values[denominator] == 0:
+            return np.nan if values[numerator] == 0 else np.inf
+        return values[numerator] / values[denominator]
+
+    def transform(self, clean_df, fillna=True, columns=None):
+        """Feature-engineer a batch using the historical group statistics."""
+        return FeatureEngineering().transform(clean_df, fillna=fillna, group_totals=self.totals, columns=columns)
@@ -0,0 +1,75 @@
+import os
+import threading
+
+
+class ThreadBudget:
+    """
+    Process-wide budget of XGBoost prediction threads.
+
+    Each prediction runs with a fixed number of threads (the pipeline's
+    `nthread`) and holds that many slots of the budget while it runs, so
+    concurrent callers in one process (e.g. several Streamlit sessions)
+    never use more than `threads` threads together; extra callers wait for
+    a running prediction to finish instead of oversubscribing the cores.
+
+    The size defaults to the FLIGHT_DELAY_PREDICT_THREADS environment
+    variable, or the number of CPUs. Use `set_thread_budget()` to change it
+    for the whole process.
+    """
+
+    ENV_VAR = "FLIGHT_DELAY_PREDICT_THREADS"
+
+    def __init__(self, threads=None):
+        if threads is None:
+            threads = int(os.environ.get(self.ENV_VAR, 0)) or os.cpu_count() or 1
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        self.threads = threads
+        self._free = threads
+        self._condition = threading.Condition()
+
+    def limit(self, nthread=None):
+        """Threads a prediction asking for `nthread` may use (None: the whole budget)."""
+        return self.threads if nthread is None else min(nthread, self.threads)
+
+    def acquire(self, n):
+        """Wait until `n` threads are free and take them (capped at the budget size)."""
+        n = min(n, self.threads)
+        with self._condition:
+            self._condition.wait_for(lambda: self._free >= n)
+            self._free -= n
+        return n
+
+    def release(self, n):
+        with self._condition:
+            self._free += n
+            self._condition.notify_all()
+
+    def run(self, nthread, func, *args, **kwargs):
+        """Call `func` while holding `nthread` threads of the budget."""
+        taken = self.acquire(nthread)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.release(taken)
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_thread_budget():
+    """The process-wide ThreadBudget, created on first use."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            _budget = ThreadBudget()
+        return _budget
+
+
+def set_thread_budget(threads):
+    """Replace the process-wide budget with one of `threads` threads (affects later predictions)."""
+    global _budget
+    with _budget_lock:
+        _budget = ThreadBudget(threads)
+        return _budget
@@ -0,0 +1,111 @@
+import math
+import numpy as np
+from backend.feature_engineering import FeatureEngineering
+
+
+class RecordFeatures:
+    """
+    Engineered features of a single input record, in plain Python.
+
+    Scalar counterpart of `DataLoaderCleaner.clean_data` followed by
+    `FeatureEngineering.transform` for one row, with the same semantics
+    (count columns truncated to int, arr_flights = 0 treated as missing,
+    NaN filled with 0). Group features are looked up in dicts precomputed
+    from the historical totals; without totals they are aggregated over the
+    record alone, like scoring a one-row batch.
+    """
+
+    REQUIRED_FIELDS = ['year', 'month', 'carrier', 'airport', 'arr_flights', 'arr_del15',
+                       'arr_cancelled', 'arr_diverted'] + FeatureEngineering.DELAY_COLS
+
+    # Engineered float features whose NaN is filled with 0 on output (delay pcts are filled when computed)
+    FILLED_FEATURES = ['cancellation_rate', 'diversion_rate', 'mean_delay_per_flight', 'carrier_vs_airport_ratio',
+                       'carrier_total_flights', 'airport_delay_rate', 'month_delay_rate', 'season_airport_delay_rate']
+
+    def __init__(self, group_totals=None, float_dtype=np.float64):
+        self.float32 = np.dtype(float_dtype) == np.float32
+        self.group_lookup = None
+        if group_totals is not None:
+            # feature -> {key value: feature value}, same values as lookup_group_feature
+            self.group_lookup = {}
+            for feature, (key, numerator, denominator) in FeatureEngineering.GROUP_FEATURES.items():
+                sums = group_totals[key]
+                values = sums[numerator] if denominator is None else sums[numerator] / sums[denominator]
+                self.group_lookup[feature] = dict(zip(sums.index, values.astype(float).tolist()))
+        self.season_by_month = {m: FeatureEngineering.SEASON_BY_MONTH.get(m, 'Fall') for m in range(1, 13)}
+
+    @staticmethod
+    def _fill(value):
+        return 0.0 if math.isnan(value) else value
+
+    @staticmethod
+    def _ratio(numerator, denominator):
+        # float64 division as in pandas: x/0 is inf (or NaN for 0/0)
+        if denominator == 0:
+            return math.nan if numerator == 0 or math.isnan(numerator) else math.copysign(math.inf, numerator)
+        return numerator / denominator
+
+    def group_feature(self, feature, key_value, del15, flights):
+        if self.group_lookup is not None:
+            default = 0.0 if FeatureEngineering.GROUP_FEATURES[feature][2] is None else math.nan
+            return self.group_lookup[feature].get(key_value, default)
+        # One-row batch: the group sums are the record's own values (NaN counted as 0)
+        _, numerator, denominator = FeatureEngineering.GROUP_FEATURES[feature]
+        sums = {'arr_del15': self._fill(del15), 'arr_flights': self._fill(flights)}
+        if denominator is None:
+            return sums[numerator]
+        return self._ratio(sums[numerator], sums[denominator])
+
+    def compute(self, record):
+        """
+        Return {feature: value} for the model inputs of one record (a dict
+        holding REQUIRED_FIELDS). Raises ValueError for missing values, the
+        rows `clean_data` would drop.
+        """
+        try:
+            values = [record[field] for field in self.REQUIRED_FIELDS]
+        except KeyError as e:
+            raise ValueError(f"Record is missing field {e}") from None
+        if any(value is None or (isinstance(value, float) and math.isnan(value)) for value in values):
+            raise ValueError("Record has missing values")
+
+        year, month = record['year'], record['month']
+        carrier, airport = str(record['carrier']), str(record['airport'])
+        del15 = float(int(record['arr_del15']))
+        flights = float(int(record['arr_flights']))
+        if flights == 0:
+            flights = math.nan
+        delays = [float(record[col]) for col in FeatureEngineering.DELAY_COLS]
+
+        total = sum(delays)
+        if total == 0:
+            total = math.nan
+        pcts = [self._fill(delay / total) for delay in delays]
+        season = self.season_by_month.get(month, 'Fall')
+
+        features = {
+            'year': year,
+            'month': month,
+            'carrier': carrier,
+            'airport': airport,
+            'season': season,
+            'cancellation_rate': float(record['arr_cancelled']) / flights,
+            'diversion_rate': float(record['arr_diverted']) / flights,
+            **dict(zip(FeatureEngineering.DELAY_PCT_COLS, pcts)),
+            'mean_delay_per_flight': total / flights,
+            'carrier_vs_airport_ratio': pcts[0] / (pcts[1] + pcts[2] + 1e-6),
+            # First largest delay column, like idxmax
+            'dominant_delay_cause': FeatureEngineering.DELAY_COLS[delays.index(max(delays))],
+            'carrier_total_flights': self.group_feature('carrier_total_flights', carrier, del15, flights),
+            'airport_delay_rate': self.group_feature('airport_delay_rate', airport, del15, flights),
+            'month_delay_rate': self.group_feature('month_delay_rate', month, del15, flights),
+            'season_airport_delay_rate': self.group_feature(
+                'season_airport_delay_rate', f"{season}_{airport}", del15, flights),
+        }
+        for name in self.FILLED_FEATURES:
+            features[name] = self._fill(features[name])
+        if self.float32:
+            # Engineered floats go through float32, as with FeatureEngineering(float_dtype=np.float32)
+            for name in self.FILLED_FEATURES + FeatureEngineering.DELAY_PCT_COLS:
+                features[name] = float(np.float32(features[name]))
+        return features
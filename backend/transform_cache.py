@@ -0,0 +1,116 @@
+import os
+import json
+import shutil
+import hashlib
+import pandas as pd
+import backend.feature_engineering as feature_engineering_module
+from backend.column_store import ColumnStore
+from backend.feature_engineering import FeatureEngineering
+
+
+class TransformCache:
+    """
+    Disk memoization of `FeatureEngineering.transform`.
+
+    Each result is saved as a `ColumnStore` frame named after a content hash
+    of the input frame, the transform arguments and the source of
+    `feature_engineering.py`, so changing the data or the feature code gives
+    a new key and stale results are never returned. Hits are memory-mapped
+    copy-on-write, so like a freshly computed result they can be modified
+    without touching the cache, and mark the entry as recently used; when the
+    cache grows past `max_bytes` the least recently used entries are removed.
+    """
+
+    DEFAULT_DIR = os.path.join(os.path.dirname(__file__), "..", ".cache", "transform")
+    MAX_BYTES = 1 << 30
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.store = ColumnStore(cache_dir or self.DEFAULT_DIR)
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+
+    @staticmethod
+    def code_version():
+        """SHA-256 of the feature engineering source."""
+        with open(feature_engineering_module.__file__, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+
+    @staticmethod
+    def _update_with_frame(digest, df):
+        schema = [(str(col), str(dtype)) for col, dtype in df.dtypes.items()]
+        digest.update(json.dumps([len(df), schema]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+
+    def key(self, df, fillna=True, group_totals=None, columns=None):
+        """Content hash identifying one transform call."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([self.FORMAT_VERSION, self.code_version(), fillna, columns]).encode())
+        self._update_with_frame(digest, df)
+        for name, sums in sorted((group_totals or {}).items()):
+            digest.update(name.encode())
+            self._update_with_frame(digest, sums)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached frame for `key`, or None on a miss."""
+        schema = self.store.read_schema(key)
+        if schema is None:
+            return None
+        try:
+            df = self.store.load(key, writable=True)
+            os.utime(os.path.join(self.store.root, key, "schema.json"))  # mark as recently used
+        except (OSError, ValueError):
+            return None
+
+        # ColumnStore keeps strings as categoricals; restore the original object columns
+        for col in schema["source"]["object_columns"]:
+            df[col] = df[col].astype(object)
+        return df
+
+    def put(self, key, df):
+        """Store `df` under `key` and evict old entries. Failures are ignored (cache is best effort)."""
+        object_columns = [col for col in df.columns if df[col].dtype == object]
+        try:
+            self.store.save(key, df, source={"key": key, "object_columns": object_columns})
+            self.evict()
+            return True
+        except (OSError, ValueError, TypeError):
+            return False
+
+    def entries(self):
+        """Cached entries as (folder, size in bytes, last used), most recently used first."""
+        if not os.path.isdir(self.store.root):
+            return []
+        entries = []
+        for name in os.listdir(self.store.root):
+            if name.startswith("."):
+                continue  # ColumnStore temp folders of in-progress saves
+            folder = os.path.join(self.store.root, name)
+            schema_path = os.path.join(folder, "schema.json")
+            if not os.path.exists(schema_path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(folder))
+            entries.append((folder, size, os.stat(schema_path).st_mtime_ns))
+        return sorted(entries, key=lambda entry: entry[2], reverse=True)
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits in `max_bytes`."""
+        total = 0
+        for folder, size, _ in self.entries():
+            total += size
+            if total > self.max_bytes:
+                shutil.rmtree(folder, ignore_errors=True)
+
+    def clear(self):
+        for folder, _, _ in self.entries():
+            shutil.rmtree(folder, ignore_errors=True)
+
+    def transform(self, df, fillna=True, group_totals=None, columns=None):
+        """Memoized `FeatureEngineering().transform(df, ...)`."""
+        key = self.key(df, fillna=fillna, group_totals=group_totals, columns=columns)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        result = FeatureEngineering().transform(df, fillna=fillna, group_totals=group_totals, columns=columns)
+        self.put(key, result)
+        return result
@@ -9,7 +9,7 @@ from utils.layout import (
     render_sidebar_chatbot
 )
 from backend.data_loader_cleaner import DataLoaderCleaner
-from backend.feature_engineering import FeatureEngineering
+from backend.transform_cache import TransformCache
 from backend.visual_explorer import VisualExplorer
 
 # ========== PAGE CONFIG ==========
@@ -67,7 +67,7 @@ def get_data_stages():
     cleaner = DataLoaderCleaner()
     raw = cleaner.load_data("data/Airline_Delay_Cause.csv")
     clean = cleaner.clean_data(raw)
-    fe = FeatureEngineering().transform(clean)
+    fe = TransformCache().transform(clean)
     return raw, clean, fe
 
 raw_df, clean_df, fe_df = get_data_stages()
@@ -117,7 +117,7 @@ k3.metric("Min", f"{df[metric_col].min():,.2f}")
 
 # ========== CATEGORICAL INSIGHTS ==========
 st.markdown("### Categorical Insights")
-cat_col = st.selectbox("Select Categorical Column", options=df.select_dtypes(include='object').columns)
+cat_col = st.selectbox("Select Categorical Column", options=df.select_dtypes(include=['object', 'category']).columns)
 
 most_common = df[cat_col].value_counts().idxmax()
 most_common_count = df[cat_col].value_counts().max()
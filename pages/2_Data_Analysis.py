@@ -12,7 +12,7 @@ from utils.layout import (
     render_title_bar
 )
 from backend.data_loader_cleaner import DataLoaderCleaner
-from backend.feature_engineering import FeatureEngineering
+from backend.transform_cache import TransformCache
 from backend.eda_analysis import FlightDataAnalysis, UnivariateAnalyzer
 
 # === PAGE CONFIG ===
@@ -77,7 +77,7 @@ def get_analysis_data():
     loader = DataLoaderCleaner()
     raw = loader.load_data("data/Airline_Delay_Cause.csv")
     clean = loader.clean_data(raw)
-    fe = FeatureEngineering().transform(clean)
+    fe = TransformCache().transform(clean)
     return raw, clean, fe
 
 raw_df, clean_df, fe_df = get_analysis_data()
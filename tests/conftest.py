@@ -0,0 +1,23 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, ROOT)
+
+from backend.data_loader_cleaner import DataLoaderCleaner  # noqa: E402
+
+SAMPLE_PATH = os.path.join(ROOT, "test_sample.csv")
+
+
+@pytest.fixture
+def raw_sample():
+    """The sample dataset shipped with the repo, as read from CSV."""
+    return pd.read_csv(SAMPLE_PATH)
+
+
+@pytest.fixture
+def clean_sample(raw_sample):
+    """The sample dataset after `DataLoaderCleaner.clean_data`."""
+    return DataLoaderCleaner(use_cache=False).clean_data(raw_sample)
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.feature_engineering import FeatureEngineering
+from backend.feature_store import GroupFeatureStore
+
+
+def assert_same_transform(df, **kwargs):
+    expected = FeatureEngineering().transform(df, **kwargs)
+    result = FeatureEngineering(backend="arrow").transform(df, **kwargs)
+    pd.testing.assert_frame_equal(result, expected, check_exact=True)
+
+
+@pytest.fixture
+def raw_with_missing_keys(raw_sample):
+    raw = raw_sample.copy()
+    raw.loc[raw.index[::7], 'airport'] = np.nan
+    raw.loc[raw.index[1::9], 'carrier'] = np.nan
+    raw.loc[raw.index[2::11], 'month'] = np.nan
+    return raw
+
+
+@pytest.mark.parametrize("fillna", [True, False])
+def test_parity_clean(clean_sample, fillna):
+    assert_same_transform(clean_sample, fillna=fillna)
+
+
+@pytest.mark.parametrize("fillna", [True, False])
+def test_parity_raw(raw_sample, raw_with_missing_keys, fillna):
+    assert_same_transform(raw_sample, fillna=fillna)
+    assert_same_transform(raw_with_missing_keys, fillna=fillna)
+
+
+def test_parity_edge_values(clean_sample):
+    df = clean_sample.copy()
+    engineer = FeatureEngineering()
+    df.loc[df.index[:3], 'arr_flights'] = 0
+    df.loc[df.index[3:6], engineer.DELAY_COLS] = 0
+    df.loc[df.index[6:8], engineer.DELAY_COLS] = np.nan
+    assert_same_transform(df)
+    assert_same_transform(df, fillna=False)
+
+
+def test_parity_group_totals(clean_sample, raw_with_missing_keys):
+    totals = GroupFeatureStore.build(clean_sample.iloc[: len(clean_sample) // 2]).totals
+    assert_same_transform(clean_sample, group_totals=totals)
+    assert_same_transform(raw_with_missing_keys, group_totals=totals)
+
+
+def test_parity_columns(clean_sample):
+    assert_same_transform(clean_sample, columns=['season', 'airport_delay_rate', 'year', 'arr_flights'])
+
+
+def test_arr_flights_dtype_kept(clean_sample):
+    result = FeatureEngineering(backend="arrow").transform(clean_sample)
+    assert result['arr_flights'].dtype == clean_sample['arr_flights'].dtype
+
+
+def test_missing_airport_combo(raw_with_missing_keys):
+    result = FeatureEngineering(backend="arrow").transform(raw_with_missing_keys)
+    missing = raw_with_missing_keys['airport'].isna()
+    assert result.loc[missing, 'season_airport_combo'].astype(str).str.endswith('_nan').all()
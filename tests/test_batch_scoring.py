@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.RegressorPipeline import RegressorPipeline
+
+
+@pytest.fixture(scope="module")
+def regressor():
+    return RegressorPipeline(group_stats_path=None)
+
+
+def read_output(path):
+    return pd.read_parquet(path) if str(path).endswith(".parquet") else pd.read_csv(path)
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.parquet"])
+def test_first_chunk_dropped(regressor, raw_sample, tmp_path, name):
+    raw = raw_sample.copy()
+    raw.loc[raw.index[:4], 'arr_del15'] = np.nan
+    raw.to_csv(tmp_path / "in.csv", index=False)
+    summary = regressor.score_csv(tmp_path / "in.csv", str(tmp_path / name), chunksize=4)
+    output = read_output(tmp_path / name)
+    assert summary["rows_scored"] == len(output) == len(raw.dropna())
+
+
+@pytest.mark.parametrize("name", ["out.csv", "out.parquet"])
+def test_all_rows_dropped(regressor, raw_sample, tmp_path, name):
+    raw = raw_sample.copy()
+    raw['arr_del15'] = np.nan
+    raw.to_csv(tmp_path / "in.csv", index=False)
+    summary = regressor.score_csv(tmp_path / "in.csv", str(tmp_path / name), chunksize=4)
+    output = read_output(tmp_path / name)
+    assert summary["rows_scored"] == 0
+    assert list(output.columns) == ["year", "month", "carrier", "airport", "predicted_arr_delay"]
+    assert len(output) == 0
@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.data_loader_cleaner import DataLoaderCleaner
+
+
+@pytest.mark.parametrize("empty_year", [2013, 2016])
+@pytest.mark.parametrize("compact", [False, True])
+def test_load_partitioned_empty_string_column(raw_sample, tmp_path, empty_year, compact):
+    for year in range(2013, 2017):
+        part = raw_sample.assign(year=year)
+        if year == empty_year:
+            part['carrier'] = np.nan
+        part.to_csv(tmp_path / f"{year}.csv", index=False)
+
+    df = DataLoaderCleaner(use_cache=False).load_partitioned(str(tmp_path), max_workers=1, compact=compact)
+    assert isinstance(df['carrier'].dtype, pd.CategoricalDtype)
+    assert list(df['carrier'].cat.categories) == sorted(raw_sample['carrier'].dropna().unique())
+    assert df.loc[df['year'] == empty_year, 'carrier'].isna().all()
+    assert df.loc[df['year'] != empty_year, 'carrier'].notna().sum() == 3 * raw_sample['carrier'].notna().sum()
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from backend.data_loader_cleaner import DataLoaderCleaner
+from backend.dataset_profiler import DatasetProfiler
+
+
+def test_column_demoted_when_strings_follow_empty_chunk(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,\n2,\n3,x\n4,y\n")
+    summary = DataLoaderCleaner().profile_data(str(path), chunksize=2)
+    assert list(summary['describe'].columns) == ['a']
+    assert summary['dtypes']['b'] == object
+    assert summary['missing'].to_dict() == {'b': 2}
+
+
+def test_duplicates_match_pandas(raw_sample):
+    df = pd.concat([raw_sample, raw_sample.iloc[::2], raw_sample.iloc[:3]], ignore_index=True)
+    profiler = DatasetProfiler()
+    for start in range(0, len(df), 4):
+        profiler.update(df.iloc[start:start + 4])
+    assert profiler.duplicates == df.duplicated().sum()
+    assert np.all(profiler.seen_hashes[1:] > profiler.seen_hashes[:-1])
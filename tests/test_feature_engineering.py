@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backend.feature_engineering import FeatureEngineering
+
+
+@pytest.mark.parametrize("kwargs", [{}, {"float_dtype": np.float32}, {"backend": "arrow"}])
+def test_transform_empty_frame(clean_sample, kwargs):
+    engineer = FeatureEngineering(**kwargs)
+    empty = engineer.transform(clean_sample.iloc[:0])
+    full = engineer.transform(clean_sample)
+    assert empty.shape == (0, full.shape[1])
+    assert list(empty.columns) == list(full.columns)
+
+
+def test_transform_parallel_empty_frame(clean_sample):
+    empty = FeatureEngineering().transform(clean_sample.iloc[:0], n_jobs=2)
+    assert list(empty.columns) == list(FeatureEngineering().transform(clean_sample).columns)
+    assert len(empty) == 0
+
+
+def test_get_seasons_matches_get_season():
+    months = pd.Series([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 0, 13, -1, 2.0, 2.5, np.nan])
+    expected = months.apply(FeatureEngineering.get_season)
+    pd.testing.assert_series_equal(FeatureEngineering.get_seasons(months), expected)
+    categorical = FeatureEngineering.get_seasons(months, as_category=True)
+    pd.testing.assert_series_equal(categorical.astype(object), expected)
+
+
+@pytest.mark.parametrize("with_nan", [False, True])
+def test_classify_risk_levels_matches_classify_risk(with_nan):
+    ratios = pd.Series([0.0, 0.1, 0.2, np.nextafter(0.2, 1), 0.4, 0.41, 1.0, np.inf, -0.5])
+    if with_nan:
+        ratios[len(ratios)] = np.nan
+    expected = ratios.apply(FeatureEngineering.classify_risk)
+    pd.testing.assert_series_equal(FeatureEngineering.classify_risk_levels(ratios), expected)
+
+
+def test_vectorized_features_match_row_wise(clean_sample):
+    result = FeatureEngineering().transform(clean_sample, fillna=False)
+    expected_season = clean_sample['month'].apply(FeatureEngineering.get_season)
+    assert (result['season'].astype(object) == expected_season).all()
+    pd.testing.assert_series_equal(result['delay_risk_level'],
+                                   result['delay_ratio'].apply(FeatureEngineering.classify_risk),
+                                   check_names=False)
+
+
+@pytest.mark.parametrize("backend", ["pandas", "arrow"])
+def test_float32_output_dtypes(clean_sample, backend):
+    result = FeatureEngineering(backend=backend, float_dtype=np.float32).transform(clean_sample)
+    reference = FeatureEngineering(backend=backend).transform(clean_sample)
+    for name in result.columns:
+        engineered = name in FeatureEngineering.FEATURE_DEPENDENCIES and name != 'arr_flights'
+        if engineered and reference[name].dtype == np.float64:
+            assert result[name].dtype == np.float32, name
+        else:
+            assert result[name].dtype == reference[name].dtype, name
+    # Pass-through input column: not cast, with or without zeros replaced
+    assert result['arr_flights'].dtype == clean_sample['arr_flights'].dtype
+    zeros = clean_sample.assign(arr_flights=clean_sample['arr_flights'].where(clean_sample.index != clean_sample.index[0], 0))
+    assert FeatureEngineering(backend=backend, float_dtype=np.float32).transform(zeros)['arr_flights'].dtype == np.float64
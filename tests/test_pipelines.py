@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import pytest
+from backend.Classifier_Pipeline import ClassifierPipeline
+from backend.RegressorPipeline import RegressorPipeline
+
+
+@pytest.fixture(scope="module", params=[ClassifierPipeline, RegressorPipeline])
+def pipeline(request):
+    return request.param()
+
+
+def reference_matrix(pipeline, features):
+    """Encode and scale with the fitted sklearn encoder and scaler, as preprocess did originally."""
+    df = features.astype({col: str for col in features.columns if isinstance(features[col].dtype, pd.CategoricalDtype)})
+    cat_cols = [col for col in pipeline.encoder.feature_names_in_ if col in df.columns]
+    num_cols = [col for col in pipeline.scaler.feature_names_in_ if col in df.columns]
+    encoded = pd.DataFrame(pipeline.encoder.transform(df[cat_cols]),
+                           columns=pipeline.encoder.get_feature_names_out(cat_cols), index=df.index)
+    scaled = pd.DataFrame(pipeline.scaler.transform(df[num_cols]), columns=num_cols, index=df.index)
+    aligned = pd.concat([scaled, encoded], axis=1).reindex(columns=pipeline.expected_features, fill_value=0)
+    return aligned.to_numpy(dtype=np.float32)
+
+
+@pytest.mark.parametrize("rows", [slice(None), slice(0, 1)])
+def test_build_matrix_matches_preprocess(pipeline, clean_sample, rows):
+    clean = clean_sample.iloc[rows]
+    features = pipeline.engineer_features(clean)
+    expected = pipeline.preprocess(features).to_numpy(dtype=np.float32)
+    X, _ = pipeline.build_matrix(clean)
+    assert X.dtype == np.float32
+    np.testing.assert_array_equal(X, expected)
+    np.testing.assert_array_equal(X, reference_matrix(pipeline, features))
+    np.testing.assert_array_equal(pipeline.build_matrix(clean, sparse=True)[0].toarray(), expected)
+
+
+def test_build_matrix_without_group_stats(clean_sample):
+    pipeline = RegressorPipeline(group_stats_path=None)
+    features = pipeline.engineer_features(clean_sample)
+    X, target = pipeline.build_matrix(clean_sample)
+    np.testing.assert_array_equal(X, reference_matrix(pipeline, features))
+    assert target is None  # the sample has no arr_delay column
+
+
+@pytest.mark.parametrize("Pipeline", [ClassifierPipeline, RegressorPipeline])
+def test_float32_predictions_match(Pipeline, clean_sample):
+    pipeline64, pipeline32 = Pipeline(), Pipeline(float_dtype=np.float32)
+    X64 = pipeline64.preprocess(pipeline64.engineer_features(clean_sample))
+    X32 = pipeline32.preprocess(pipeline32.engineer_features(clean_sample))
+    assert set(X32.dtypes) == {np.dtype(np.float32)}
+    np.testing.assert_allclose(X32.to_numpy(), X64.to_numpy(), rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(pipeline32.inplace_predict(X32), pipeline64.inplace_predict(X64), rtol=1e-5, atol=1e-5)
+    if Pipeline is ClassifierPipeline:
+        np.testing.assert_array_equal(pipeline32.predict(X32), pipeline64.predict(X64))
+    X, _ = pipeline32.build_matrix(clean_sample)
+    np.testing.assert_array_equal(X, X32.to_numpy())
+
+
+def test_concurrent_predictions(pipeline, clean_sample, raw_sample):
+    X, _ = pipeline.build_matrix(clean_sample)
+    expected = pipeline.inplace_predict(X)
+    records = raw_sample.dropna().to_dict('records')
+    expected_one = [pipeline.predict_one(record) for record in records]
+
+    def work(i):
+        if i % 2:
+            return [pipeline.predict_one(record) for record in records] == expected_one
+        return np.array_equal(pipeline.inplace_predict(X, nthread=1 + i % 3), expected)
+
+    with ThreadPoolExecutor(4) as pool:
+        assert all(pool.map(work, range(24)))
+    assert (False, pipeline.RECORD_NTHREAD) in pipeline._thread_boosters
@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+from backend.transform_cache import TransformCache
+
+
+def test_hit_and_miss_return_the_same_kind_of_frame(clean_sample, tmp_path):
+    cache = TransformCache(cache_dir=str(tmp_path))
+    miss = cache.transform(clean_sample)
+    hit = cache.transform(clean_sample)
+    pd.testing.assert_frame_equal(hit, miss)
+
+    for frame in (miss, hit):
+        numeric = frame.select_dtypes('number')
+        assert all(numeric[col].to_numpy().flags.writeable for col in numeric.columns)
+        frame.loc[frame.index[0], 'delay_ratio'] = -1.0
+        frame['delay_ratio'].to_numpy()[1] = -2.0
+        assert frame['delay_ratio'].iloc[:2].tolist() == [-1.0, -2.0]
+
+    # Writes to a hit stay in memory; the cached entry is unchanged
+    pd.testing.assert_frame_equal(cache.transform(clean_sample), cache.transform(clean_sample.copy()))
+    assert cache.transform(clean_sample)['delay_ratio'].iloc[0] != -1.0
+    assert np.isfinite(cache.transform(clean_sample)['delay_ratio']).all()